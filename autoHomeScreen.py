@@ -1,11 +1,67 @@
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView
+)
+from PyQt6.QtCore import Qt, QThreadPool, QTimer
+from PyQt6.QtGui import QFont, QColor
+from sqlalchemy import inspect, or_, and_
+
+from changeFeed import ChangeFeed
+from notfications import NotificationOverlay
+from queryWorker import QueryWorker
+from formSpec import compile_form_spec
+from fullTextSearch import FullTextIndex
+from searchIndex import RowSearchIndex, is_text_column
+from sessionManager import engine, session
+from submitQueue import SubmitQueue
+from tableModel import ColumnTableModel, PagedQueryModel, GroupedQueryModel, group_counts, group_rows
+
+
 class HomeScreen(QWidget):
-    def __init__(self, model_class, *args, **kwargs):
+    def __init__(self, model_class, use_model_view=False, page_size=None, filter_delay_ms=300,
+                 client_side_search=False, full_text_search=False, poll_interval_ms=None, async_submit=False,
+                 *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.model_class = model_class
         self.fields = [column.name for column in inspect(model_class).c]
+        self.text_fields = [column.name for column in inspect(model_class).c if is_text_column(column)]
+        self.text_positions = [self.fields.index(field) for field in self.text_fields]
+        self.key_field = inspect(model_class).primary_key[0].name
+        self.key_position = self.fields.index(self.key_field)
+        # Filter text against an in-memory index of the loaded rows instead of the database
+        self.search_index = RowSearchIndex(self._row_text_values) if client_side_search else None
+        # Route filter text through an FTS5 MATCH instead of a full-scan ilike
+        self.full_text_index = None
+        if full_text_search:
+            self.full_text_index = FullTextIndex(engine, model_class)
+            self.full_text_index.create()
+        self.use_model_view = use_model_view or bool(page_size)  # QTableView + ColumnTableModel instead of QTableWidget
+        self.page_size = page_size  # Rows per fetchMore page; None loads the whole result
         self.grouping_enabled = True
         self.group_by_column = None
         self.option_filters = {}
+        self._change_feed_state = None  # Filters the change feed's pending batch is checked against
+
+        # Filter queries run on the thread pool; only the newest generation is shown
+        self.thread_pool = QThreadPool.globalInstance()
+        self._query_generation = 0
+        self._active_worker = None
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(filter_delay_ms)
+        self.filter_timer.timeout.connect(self.load_data_async)
+
+        # Forms commit through a background queue that outlives each form window
+        self.submit_queue = SubmitQueue(engine, parent=self) if async_submit else None
+
+        # Pick up rows other users write to the same database without reloading
+        self.change_feed = None
+        if poll_interval_ms:
+            self.change_feed = ChangeFeed(engine, model_class, interval_ms=poll_interval_ms, parent=self)
+            self.change_feed.filter_snapshot = self._change_feed_filter
+            self.change_feed.changed.connect(self.apply_changes)
+            self.change_feed.reset.connect(self.load_data)
+            self.change_feed.failed.connect(lambda message: print(f"Error: {message}"))
 
         # Main Layout
         self.layout = QVBoxLayout()
@@ -22,41 +78,70 @@ class HomeScreen(QWidget):
 
         # Create Options Panel
         self.options_panel = self.create_options_panel()
+        self.filter_input.textChanged.connect(self.schedule_filter)
 
         # Table Widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(len(self.fields))
-        self.table.setHorizontalHeaderLabels(self.fields)
+        if self.use_model_view:
+            self.table = QTableView()
+            if self.page_size:
+                self.flat_model = PagedQueryModel(self.fields, page_size=self.page_size, parent=self)
+            else:
+                self.flat_model = ColumnTableModel(self.fields, self)
+            # Grouped views get their headers and counts from SQL and expand on click
+            self.group_model = GroupedQueryModel(self.fields, self)
+            self.table_model = self.flat_model
+            self.table.setModel(self.table_model)
+            self.table.clicked.connect(self._on_table_clicked)
+            self.table.doubleClicked.connect(lambda index: self.open_edit_form(index.row(), index.column()))
+        else:
+            self.table = QTableWidget()
+            self.table.setColumnCount(len(self.fields))
+            self.table.setHorizontalHeaderLabels(self.fields)
+            self.table.cellDoubleClicked.connect(self.open_edit_form)
         self.table.setSortingEnabled(True)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
 
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         header.setStretchLastSection(True)
 
-        self.table.cellDoubleClicked.connect(self.open_edit_form)
         self.layout.addWidget(self.table)
 
         self.setLayout(self.layout)
         self.setWindowTitle(f"{self.model_class.__name__} Home")
         self.setMinimumSize(800, 600)
 
-        # Load initial data
+        # Load initial data; the feed's watermark is taken first so no change is missed
+        if self.change_feed is not None:
+            self.change_feed.start()
         self.load_data()
 
     def open_create_form(self):
         """Open the create form with a callback to refresh the table."""
-        self.form = ModelForm(self.model_class, included_columns=['date', 'name', 'country', 'role'], callback=self.load_data)
+        self.form = ModelForm(self.model_class, included_columns=['date', 'name', 'country', 'role'], callback=self.item_added,
+                              submit_queue=self.submit_queue)
         self.form.show()
 
-    def load_data(self):
-        """Fetch and display data with filtering and optional grouping."""
+    def filter_state(self):
+        """Snapshot the filter widgets so a query can be built away from the GUI thread."""
         filter_text = self.filter_input.text().lower()
+        selected_options = {
+            field: [opt for opt, cb in options.items() if cb.isChecked()]
+            for field, options in self.option_filters.items()
+        }
+        return filter_text, selected_options
+
+    def build_query(self, session, filter_state=None):
+        """Build the filtered query for the current filter text and option filters."""
+        filter_text, selected_options = filter_state or self.filter_state()
         query = session.query(self.model_class)
 
         # Apply text filters
-        if filter_text:
+        if filter_text and self.full_text_index is not None and self.full_text_index.can_match(filter_text):
+            # Paged models add their own keyset ORDER BY, so only rank flat loads
+            query = self.full_text_index.match(query, filter_text, ranked=not self._is_paging())
+        elif filter_text:
             filters = [
                 getattr(self.model_class, field).ilike(f"%{filter_text}%")
                 for field in self.fields if hasattr(getattr(self.model_class, field), 'ilike')
@@ -65,21 +150,267 @@ class HomeScreen(QWidget):
 
         # Apply option field filters
         option_filters = []
-        for field, options in self.option_filters.items():
-            selected = [opt for opt, cb in options.items() if cb.isChecked()]
+        for field, selected in selected_options.items():
             if selected:
                 option_filters.append(getattr(self.model_class, field).in_(selected))
 
         if option_filters:
             query = query.filter(and_(*option_filters))
 
-        data = query.all()
+        return query
+
+    def load_data(self):
+        """Fetch and display data with filtering and optional grouping."""
+        self._cancel_pending_query()
+
+        if self._uses_search_index():
+            # Load without the text filter once; filter text is answered by the index
+            filter_text, selected_options = self.filter_state()
+            self.search_index.build(self._fetch_data(self.build_query(session, ("", selected_options))))
+            self._show_data(self.search_index.search(filter_text))
+            return
+
+        query = self.build_query(session)
+
+        if self._is_paging():
+            self._load_pages(query)
+            return
+
+        self._show_data(self._fetch_data(query))
+
+    def schedule_filter(self):
+        """Restart the debounce timer; the query runs once typing pauses."""
+        self.filter_timer.start()
+
+    def load_data_async(self):
+        """Run the filter query on the thread pool, superseding any query still running."""
+        if self._uses_search_index():
+            if not self.search_index.is_built:
+                self.load_data()
+                return
+            self._cancel_pending_query()
+            self._show_data(self.search_index.search(self.filter_input.text()))
+            return
+
+        if self._is_paging():
+            # Paging only reads one LIMITed page, so it stays on the GUI thread
+            self.load_data()
+            return
+
+        self._cancel_pending_query()
+        state = self.filter_state()
+        worker = QueryWorker(engine, self._query_generation,
+                             lambda worker_session: self._fetch_data(self.build_query(worker_session, state)))
+        worker.signals.finished.connect(self._on_query_finished)
+        worker.signals.failed.connect(self._on_query_failed)
+        self._active_worker = worker
+        self.thread_pool.start(worker)
+
+    def item_added(self, instance):
+        """Show a row created by ModelForm without rebuilding the table."""
+        self._apply_change(instance, is_new=True)
+
+    def item_updated(self, instance):
+        """Refresh an edited row, moving it if its sort or group value changed."""
+        self._apply_change(instance, is_new=False)
+
+    def item_removed(self, key):
+        """Drop the row with primary key key from the view."""
+        self._update_search_index(key, None, is_new=False)
+        if not self.use_model_view:
+            self._refresh_widget_table()
+            return
+
+        if self._remove_row(key):
+            self._refresh_group_counts()
+        self._apply_group_spans()
+
+    def _apply_change(self, instance, is_new):
+        values = tuple(getattr(instance, field) for field in self.fields)
+        key = values[self.key_position]
+        self._update_search_index(key, instance, is_new)
+
+        if not self.use_model_view:
+            self._refresh_widget_table()
+            return
+
+        # Only the affected row moves; the model binary-searches its slot
+        stale_counts = not is_new and self._remove_row(key)
+        if self._row_matches_filters(key):
+            self.table_model.insert_record(values)
+        if stale_counts:
+            self._refresh_group_counts()
+        self._apply_group_spans()
+
+    def apply_changes(self, instances, removed_keys, visible_keys=None):
+        """Apply rows other users changed, as reported by the change feed.
+
+        visible_keys are the changed keys that pass the filters, as checked on
+        the feed's worker; None means every row is visible.
+        """
+        if self.use_model_view:
+            if self.filter_state() != self._change_feed_state:
+                # The filters changed while the feed's worker ran, so check the batch again
+                keys = [getattr(instance, self.key_field) for instance in instances]
+                visible_keys = self._visible_keys(session, keys, self.filter_state())
+
+            stale_counts = False
+            for key in removed_keys:
+                self._update_search_index(key, None, is_new=False)
+                stale_counts |= self._remove_row(key)
+            for instance in instances:  # Also covers inserts, including our own
+                values = tuple(getattr(instance, field) for field in self.fields)
+                key = values[self.key_position]
+                self._update_search_index(key, instance, is_new=False)
+                stale_counts |= self._remove_row(key)
+                if visible_keys is None or key in visible_keys:
+                    self.table_model.insert_record(values)
+            if stale_counts:
+                self._refresh_group_counts()  # Once for the whole batch
+            self._apply_group_spans()
+            return
+
+        # QTableWidget is redrawn once for the whole batch
+        for key in removed_keys:
+            self._update_search_index(key, None, is_new=False)
+        for instance in instances:
+            self._update_search_index(getattr(instance, self.key_field), instance, is_new=False)
+        self._refresh_widget_table()
+
+    def _update_search_index(self, key, instance, is_new):
+        """Replace (or with instance=None, drop) one row in the client-side index."""
+        if not (self._uses_search_index() and self.search_index.is_built):
+            return
+        if not is_new:
+            self.search_index.remove(lambda row: self._row_key(row) == key)
+        if instance is not None and self._matches_option_filters(instance):
+            values = tuple(getattr(instance, field) for field in self.fields)
+            self.search_index.add(values if self.use_model_view else instance)
+
+    def _refresh_widget_table(self):
+        # QTableWidget has no model to patch, but the search index can still spare the query
+        if self._uses_search_index() and self.search_index.is_built:
+            self._show_data(self.search_index.search(self.filter_input.text()))
+        else:
+            self.load_data()
+
+    def _row_key(self, row):
+        if self.use_model_view:
+            return row[self.key_position]
+        return getattr(row, self.key_field)
+
+    def _matches_option_filters(self, instance):
+        _, selected_options = self.filter_state()
+        return all(not selected or getattr(instance, field) in selected
+                   for field, selected in selected_options.items())
+
+    def _row_matches_filters(self, key):
+        """Ask the database whether one row passes the current filters (a primary key lookup)."""
+        visible_keys = self._visible_keys(session, [key], self.filter_state())
+        return visible_keys is None or key in visible_keys
+
+    def _visible_keys(self, session, keys, filter_state):
+        """Return the keys whose rows pass filter_state, or None if nothing is filtered out."""
+        filter_text, selected_options = filter_state
+        if not filter_text and not any(selected_options.values()):
+            return None
+        key_column = getattr(self.model_class, self.key_field)
+        query = self.build_query(session, filter_state).order_by(None).with_entities(key_column)
+        visible_keys = set()
+        for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+            visible_keys.update(key for key, in query.filter(key_column.in_(keys[start:start + 500])))
+        return visible_keys
+
+    def _change_feed_filter(self):
+        """Snapshot the filters so the change feed checks its whole batch on the worker."""
+        if not self.use_model_view:
+            return None  # QTableWidget reloads instead of patching rows
+        state = self._change_feed_state = self.filter_state()
+        return lambda worker_session, keys: self._visible_keys(worker_session, keys, state)
+
+    def _remove_row(self, key):
+        """Drop one row from the table model; True if group counts need a refresh."""
+        found = self.table_model.remove_record(self.key_position, key)
+        return not found and self.table_model is self.group_model  # The row sat in a collapsed group
+
+    def _refresh_group_counts(self):
+        group_expr = getattr(self.model_class, self.group_by_column)
+        self.group_model.set_counts(group_counts(self.build_query(session), group_expr))
+
+    def _row_text_values(self, row):
+        if self.use_model_view:
+            return [row[position] for position in self.text_positions]
+        return [getattr(row, field) for field in self.text_fields]
+
+    def _uses_search_index(self):
+        return self.search_index is not None and not self._is_paging()
+
+    def _cancel_pending_query(self):
+        """Invalidate results from any query still running on the thread pool."""
+        self._query_generation += 1
+        if self._active_worker is not None:
+            self._active_worker.cancel()
+            self._active_worker = None
+
+    def _on_query_finished(self, generation, data):
+        if generation != self._query_generation:
+            return  # A newer query was started while this one ran
+        self._active_worker = None
+        self._show_data(data)
+
+    def _on_query_failed(self, generation, message):
+        if generation != self._query_generation:
+            return
+        self._active_worker = None
+        print(f"Error: {message}")
+
+    def _shows_relevance_order(self):
+        """Whether loaded rows arrive ordered by bm25 rank, which a column sort would undo."""
+        filter_text = self.filter_input.text().lower()
+        return (self.full_text_index is not None and self.full_text_index.can_match(filter_text)
+                and not self._uses_search_index() and not self._is_paging() and not self._is_grouping())
+
+    def _is_grouping(self):
+        return bool(self.grouping_enabled and self.group_by_column)
+
+    def _is_paging(self):
+        return bool(self.page_size) and not self._is_grouping()
+
+    def _uses_sql_grouping(self):
+        # The client-side index needs every row loaded, so it keeps grouping in memory
+        return self.use_model_view and self._is_grouping() and self.search_index is None
+
+    def _fetch_data(self, query):
+        """Run query and return what _show_data needs; safe to call on a worker thread."""
+        if self._uses_sql_grouping():
+            return group_counts(query, getattr(self.model_class, self.group_by_column))
+        if self.use_model_view:
+            columns = [getattr(self.model_class, field) for field in self.fields]
+            return query.with_entities(*columns).all()
+        if self._is_grouping():
+            # Let the database order by group so the sort in _group_data is a linear pass
+            query = query.order_by(None).order_by(getattr(self.model_class, self.group_by_column))
+        return query.all()
+
+    def _show_data(self, data):
+        """Display fetched rows in the table widget or the table model."""
+        if self._uses_sql_grouping():
+            self._show_groups(data)
+            return
+        if self.use_model_view:
+            self._show_model_rows(data)
+            return
 
         # Group data or show flat list
         grouped_data = self._group_data(data) if self.grouping_enabled and self.group_by_column else [
             (False, [getattr(row, field) for field in self.fields]) for row in data
         ]
 
+        # Fill with sorting off so rows keep the query's order instead of moving as items land
+        self.table.setSortingEnabled(False)
+        if self._shows_relevance_order():
+            self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+
         # Clear and repopulate the table
         self.table.setRowCount(0)
         self.table.clearContents()
@@ -95,6 +426,72 @@ class HomeScreen(QWidget):
                 for col_idx, value in enumerate(row_data):
                     self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
 
+        # Re-enabling applies the user's column sort, if any is still indicated
+        self.table.setSortingEnabled(True)
+
+    def _load_pages(self, query):
+        """Read only the first page; the view pulls the rest while scrolling."""
+        self._set_table_model(self.flat_model)
+        header = self.table.horizontalHeader()
+        if header.sortIndicatorSection() >= 0:
+            self.table_model.sort_index = header.sortIndicatorSection()
+            self.table_model.descending = header.sortIndicatorOrder() == Qt.SortOrder.DescendingOrder
+        columns = [getattr(self.model_class, field) for field in self.fields]
+        key_column = inspect(self.model_class).primary_key[0]
+        self.table_model.set_query(query, columns, key_column)
+        self.table.clearSpans()
+
+    def _show_model_rows(self, rows):
+        """Fill the table model with plain column tuples instead of ORM objects and items."""
+        self._set_table_model(self.flat_model)
+        group_column = self.group_by_column if self.grouping_enabled else None
+        self.table_model.set_rows(rows, group_column=group_column)
+
+        # Keep the user's sort order across reloads, as QTableWidget does, unless
+        # the rows come ranked by relevance; a header click re-sorts them by column
+        header = self.table.horizontalHeader()
+        if self._shows_relevance_order():
+            header.blockSignals(True)  # Clearing the indicator would otherwise re-sort the model
+            header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            header.blockSignals(False)
+        elif header.sortIndicatorSection() >= 0:
+            self.table_model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+
+        self._apply_group_spans()
+
+    def _show_groups(self, groups):
+        """Show collapsed group headers; a group's rows are queried when it is expanded."""
+        self._set_table_model(self.group_model)
+        state = self.filter_state()
+        columns = [getattr(self.model_class, field) for field in self.fields]
+        group_expr = getattr(self.model_class, self.group_by_column)
+
+        def fetch_group(group_value, sort_index, descending):
+            query = self.build_query(session, state)
+            return group_rows(query, columns, group_expr, group_value, sort_index, descending)
+
+        header = self.table.horizontalHeader()
+        if header.sortIndicatorSection() >= 0:
+            self.group_model.sort_index = header.sortIndicatorSection()
+            self.group_model.descending = header.sortIndicatorOrder() == Qt.SortOrder.DescendingOrder
+        self.group_model.set_groups(groups, fetch_group, self.fields.index(self.group_by_column))
+        self._apply_group_spans()
+
+    def _on_table_clicked(self, index):
+        if self.table_model is self.group_model:
+            self.group_model.toggle_group(index.row())
+            self._apply_group_spans()
+
+    def _set_table_model(self, model):
+        if model is not self.table_model:
+            self.table_model = model
+            self.table.setModel(model)
+
+    def _apply_group_spans(self):
+        self.table.clearSpans()
+        for row_idx in self.table_model.group_header_rows():
+            self.table.setSpan(row_idx, 0, 1, self.table_model.columnCount())
+
     def _group_data(self, data):
         """Group data based on the selected column."""
         grouped_data = []
@@ -113,33 +510,39 @@ class HomeScreen(QWidget):
     # Other methods remain the same...
 
 class ModelForm(QWidget):
-    def __init__(self, model_class, included_columns=None, instance=None, callback=None, *args, **kwargs):
+    def __init__(self, model_class, included_columns=None, instance=None, callback=None, submit_queue=None,
+                 *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.model_class = model_class
         self.instance = instance
         self.callback = callback  # Store the callback to refresh the table
+        self.submit_queue = submit_queue  # Commit on the queue's worker thread instead of the GUI thread
+        self._listening = False  # Connected to submit_queue's signals
         self.fields = {}
 
         # Set up the form layout
         form_layout = QVBoxLayout()
         included_columns = included_columns or []
 
-        for column in inspect(self.model_class).c:
-            if column.name in included_columns:
-                label = QLabel(column.name.capitalize())
-                field = QLineEdit()
-                form_layout.addWidget(label)
-                form_layout.addWidget(field)
-                self.fields[column.name] = field
+        for field_spec in compile_form_spec(self.model_class, included_columns):
+            label = QLabel(field_spec.label)
+            field = QLineEdit()
+            form_layout.addWidget(label)
+            form_layout.addWidget(field)
+            self.fields[field_spec.name] = field
 
-        submit_button = QPushButton("Submit")
-        submit_button.clicked.connect(self.submit_form)
-        form_layout.addWidget(submit_button)
+        self.submit_button = QPushButton("Submit")
+        self.submit_button.clicked.connect(self.submit_form)
+        form_layout.addWidget(self.submit_button)
 
         self.setLayout(form_layout)
         self.setWindowTitle("Create / Edit Entry")
         self.setFixedSize(400, 300)
 
+        self.notification_overlay = NotificationOverlay(self)
+        self.notification_overlay.setGeometry(20, 20, 360, 120)
+        self.notification_overlay.hide()
+
     def submit_form(self):
         """Submit the form data to the database."""
         new_entry = self.model_class()
@@ -147,21 +550,92 @@ class ModelForm(QWidget):
         for field_name, field_widget in self.fields.items():
             setattr(new_entry, field_name, field_widget.text())
 
+        if self.submit_queue is not None:
+            # The form stays open, without a second submit, until the worker reports back
+            self.submit_button.setEnabled(False)
+            self.notification_overlay.clear_all_errors()
+            self.notification_overlay.hide()
+            self._listen_to_queue(True)
+            self.submit_queue.submit(lambda worker_session: self._write_entry(worker_session, new_entry), tag=self)
+            return
+
         try:
             session.add(new_entry)
             session.commit()
-            print(f"{self.model_class.__name__} added successfully!")
-            if self.callback:
-                self.callback()  # Call the callback to refresh the table
-            self.close()
+            self._on_submit_succeeded(self, new_entry)
         except Exception as e:
             session.rollback()
             print(f"Error: {e}")
 
+    @staticmethod
+    def _write_entry(worker_session, entry):
+        worker_session.add(entry)
+        return entry
+
+    def _listen_to_queue(self, listen):
+        """The queue is shared by every form, so only listen to it while this form's write is in flight."""
+        if listen == self._listening:
+            return
+        connections = (
+            (self.submit_queue.succeeded, self._on_submit_succeeded),
+            (self.submit_queue.failed, self._on_submit_failed),
+            (self.submit_queue.retrying, self._on_submit_retrying),
+        )
+        for signal, slot in connections:
+            if listen:
+                signal.connect(slot)
+            else:
+                signal.disconnect(slot)
+        self._listening = listen
+
+    def _on_submit_succeeded(self, tag, entry):
+        if tag is not self:
+            return
+        self._listen_to_queue(False)
+        print(f"{self.model_class.__name__} added successfully!")
+        self.submit_button.setEnabled(True)
+        if self.callback:
+            self.callback(entry)  # Let the table show the new row
+        self.close()
+
+    def _on_submit_failed(self, tag, message):
+        if tag is not self:
+            return
+        self._listen_to_queue(False)
+        print(f"Error: {message}")
+        self.submit_button.setEnabled(True)
+        self.notification_overlay.add_error(f"Could not save: {message}")
+        self.notification_overlay.show()
+
+    def _on_submit_retrying(self, tag, attempt, delay):
+        if tag is self:
+            print(f"Database is locked, retrying in {delay:.2f}s (attempt {attempt})")
+
 # Main Execution
 if __name__ == "__main__":
     import sys
+    from sqlalchemy import Column, Integer, String
+    from sqlalchemy.orm import declarative_base
+
+    # A self-contained table to try the screen on; the repo ships no models of its own
+    Base = declarative_base()
+
+    class User(Base):
+        __tablename__ = 'users'
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        email = Column(String)
+        department = Column(String)
+
+    Base.metadata.create_all(engine)
+
     app = QApplication(sys.argv)
-    home_screen = HomeScreen(User)
+    home_screen = HomeScreen(
+        User,
+        use_model_view="--model-view" in sys.argv,
+        page_size=500 if "--paged" in sys.argv else None,
+        poll_interval_ms=2000 if "--live" in sys.argv else None,
+        async_submit="--async-submit" in sys.argv,
+    )
     home_screen.show()
     sys.exit(app.exec())
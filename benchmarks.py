@@ -0,0 +1,246 @@
+"""Headless benchmarks for the table and form hot paths.
+
+    python benchmarks.py                          # compare against benchmark_baselines.json
+    python benchmarks.py --rows 1000 1000000 --columns 10 200
+    python benchmarks.py --update-baseline        # record the current numbers as the baseline
+
+Every case runs on Qt's offscreen platform against synthetic models in an
+in-memory SQLite database. Time is the best of --repeat runs; peak memory
+comes from one extra run under tracemalloc, so it counts Python allocations
+(rows, ORM objects, items) but not Qt's own C++ memory. Cases slower than
+their baseline by more than --tolerance are reported and fail the run.
+"""
+import os
+
+# Both must be set before Qt and sessionManager are imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from PyQt6.QtWidgets import QApplication, QLineEdit, QTableWidget, QWidget
+from sqlalchemy import Column, Date, Float, Integer, String, func, insert, select
+from sqlalchemy.orm import declarative_base
+
+from autoHomeScreen import HomeScreen
+from button import loadDataObjects
+from formSpec import invalidate_form_spec
+from pyqtAutoModel import ModelFormFields
+from sessionManager import engine, session
+
+BASELINE_PATH = 'benchmark_baselines.json'
+GROUP_COUNT = 50  # Distinct values in each model's 'category' column
+
+Base = declarative_base()
+_models = {}
+
+
+def bench_model(column_count):
+    """Return a model with an id, a 'category' to group by and column_count - 2 mixed-type columns."""
+    model = _models.get(column_count)
+    if model is None:
+        attributes = {
+            '__tablename__': f'bench_{column_count}',
+            'id': Column(Integer, primary_key=True),
+            'category': Column(String),
+        }
+        kinds = (String, Integer, Float, Date)
+        for i in range(column_count - 2):
+            attributes[f'col_{i}'] = Column(kinds[i % len(kinds)])
+        model = _models[column_count] = type(f'Bench{column_count}', (Base,), attributes)
+        Base.metadata.create_all(engine, tables=[model.__table__])
+    return model
+
+
+def fill_rows(model, row_count, batch_size=10000):
+    """Insert rows until the model's table holds row_count of them."""
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(model.__table__)).scalar()
+    columns = [column for column in model.__table__.columns if column.name not in ('id', 'category')]
+    start_date = date(2020, 1, 1)
+
+    def value(column, n):
+        python_type = column.type.python_type
+        if python_type is str:
+            return f'{column.name} value {n}'
+        if python_type is int:
+            return n
+        if python_type is float:
+            return n / 7
+        return start_date + timedelta(days=n % 3650)
+
+    for batch_start in range(existing, row_count, batch_size):
+        rows = [
+            {'id': n + 1, 'category': f'group {n * 7919 % GROUP_COUNT}',
+             **{column.name: value(column, n) for column in columns}}
+            for n in range(batch_start, min(batch_start + batch_size, row_count))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(model.__table__), rows)
+
+
+class BenchHomeScreen(HomeScreen):
+    """HomeScreen with stand-ins for the option panel methods it calls but does not define yet.
+
+    The initial load in __init__ is skipped so only the load_data() calls
+    made by a benchmark are measured.
+    """
+
+    _loading_enabled = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loading_enabled = True
+
+    def create_options_panel(self):
+        self.filter_input = QLineEdit()
+        return QWidget()
+
+    def toggle_options_panel(self):
+        pass
+
+    def open_edit_form(self, row, column):
+        pass
+
+    def load_data(self):
+        if self._loading_enabled:
+            super().load_data()
+
+
+def measure(run, repeat):
+    """Return (best seconds, peak traced bytes) for run(), which returns a callable to time."""
+    best = None
+    for _ in range(repeat):
+        operation = run()
+        gc.collect()
+        start = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        QApplication.processEvents()  # Let deleteLater() clean up outside the timing
+
+    operation = run()
+    gc.collect()
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    QApplication.processEvents()
+    return best, peak
+
+
+def cases(row_counts, column_counts):
+    """Yield (name, rows, columns, run) for every benchmark; run() prepares a case and returns what to time."""
+    for column_count in column_counts:
+        model = bench_model(column_count)
+        fields = [column.name for column in model.__table__.columns]
+
+        def build_fields_cold(model=model, fields=fields):
+            form_fields = ModelFormFields(model, included_columns=fields)
+            invalidate_form_spec(model)
+            return form_fields.build_fields
+
+        def build_fields(model=model, fields=fields):
+            return ModelFormFields(model, included_columns=fields).build_fields
+
+        yield 'ModelFormFields.build_fields (cold spec)', None, column_count, build_fields_cold
+        yield 'ModelFormFields.build_fields', None, column_count, build_fields
+
+        for row_count in row_counts:
+            fill_rows(model, row_count)
+
+            def objects(model=model):
+                session.remove()
+                return session.query(model).order_by(model.id).all()
+
+            def load_objects(row_action, action_delegate=False):
+                def run(objects=objects):
+                    table, rows = QTableWidget(), objects()
+                    return lambda: loadDataObjects(table, rows, [], rowAction=row_action,
+                                                   actionDelegate=action_delegate)
+                return run
+
+            def load_data(**options):
+                def run(model=model):
+                    session.remove()
+                    return BenchHomeScreen(model, **options).load_data
+                return run
+
+            def group_data(model=model, objects=objects):
+                screen = BenchHomeScreen(model)
+                screen.group_by_column = 'category'
+                data = objects()
+                return lambda: screen._group_data(data)
+
+            yield 'loadDataObjects', row_count, column_count, load_objects(None)
+            yield 'loadDataObjects (row actions)', row_count, column_count, load_objects(lambda row: None)
+            yield 'loadDataObjects (delegate row actions)', row_count, column_count, \
+                load_objects(lambda row: None, action_delegate=True)
+            yield 'HomeScreen._group_data', row_count, column_count, group_data
+            yield 'HomeScreen.load_data', row_count, column_count, load_data()
+            yield 'HomeScreen.load_data (model view)', row_count, column_count, load_data(use_model_view=True)
+            yield 'HomeScreen.load_data (paged)', row_count, column_count, load_data(page_size=500)
+
+
+def case_key(name, row_count, column_count):
+    size = f"columns={column_count}" if row_count is None else f"rows={row_count},columns={column_count}"
+    return f"{name}[{size}]"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help="row counts (default: 1000 10000)")
+    parser.add_argument('--columns', type=int, nargs='+', default=[10, 50], help="column counts (default: 10 50)")
+    parser.add_argument('--only', help="run only cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown before failing (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    QApplication.instance() or QApplication(sys.argv)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    results = {}
+    regressions = []
+    print(f"{'case':<72}{'seconds':>10}{'baseline':>10}{'ratio':>8}{'peak MB':>10}")
+    for name, row_count, column_count, run in cases(sorted(args.rows), sorted(args.columns)):
+        if args.only and args.only not in name:
+            continue
+        key = case_key(name, row_count, column_count)
+        seconds, peak = measure(run, args.repeat)
+        results[key] = {'seconds': round(seconds, 6), 'peak_bytes': peak}
+
+        previous = baseline.get(key)
+        ratio = seconds / previous['seconds'] if previous and previous['seconds'] else None
+        if ratio is not None and ratio > 1 + args.tolerance:
+            regressions.append(key)
+        print(f"{key:<72}{seconds:>10.4f}"
+              f"{previous['seconds'] if previous else float('nan'):>10.4f}"
+              f"{ratio if ratio is not None else float('nan'):>8.2f}"
+              f"{peak / 1024 / 1024:>10.2f}", flush=True)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}.")
+    elif regressions:
+        print(f"{len(regressions)} cases are more than {args.tolerance:.0%} slower than the baseline:")
+        for key in regressions:
+            print(f"  {key}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,82 @@
 from PyQt6.QtWidgets import QApplication, QTableWidget, QPushButton, QTableWidgetItem
-from PyQt6.QtCore import QSize
-from PyQt6.QtWidgets import QHeaderView
-
-
-def loadDataObjects(table, objectArray: list, columnNameFilter: list = None, rowAction=None) -> None:
+from PyQt6.QtCore import QEvent, QRect, QSize, Qt
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QHeaderView, QStyle, QStyledItemDelegate
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Paints an "Action" button in every cell of a column and calls rowAction(row) when one is clicked.
+
+    Nothing is created per row, unlike a QPushButton cell widget for each
+    row, so a table with an action column builds and scrolls as fast as one
+    without it.
+    """
+
+    def __init__(self, rowAction, text="Action", buttonSize=QSize(50, 30), parent=None):
+        super().__init__(parent)
+        self.rowAction = rowAction
+        self.text = text
+        self.buttonSize = buttonSize
+        self.pressedRow = None  # Row whose button is held down
+
+    def buttonRect(self, cellRect):
+        """The button's rectangle, centered in the cell like the fixed-size QPushButton was."""
+        rect = QRect(0, 0, min(self.buttonSize.width(), cellRect.width()),
+                     min(self.buttonSize.height(), cellRect.height()))
+        rect.moveCenter(cellRect.center())
+        return rect
+
+    def paint(self, painter, option, index):
+        rect = self.buttonRect(option.rect)
+        pressed = index.row() == self.pressedRow
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QColor("#ccc"))  # Same look as the old "border: 1px solid #ccc; border-radius: 5px;"
+        painter.setBrush(option.palette.mid() if pressed else option.palette.midlight() if hovered
+                         else option.palette.button())
+        painter.drawRoundedRect(rect, 5, 5)
+        painter.setPen(option.palette.buttonText().color())
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, self.text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+
+        onButton = self.buttonRect(option.rect).contains(event.position().toPoint())
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self.pressedRow = index.row() if onButton else None
+        else:
+            clicked = onButton and self.pressedRow == index.row()
+            self.pressedRow = None
+            if clicked:
+                self.rowAction(index.row())
+        if option.widget is not None:
+            option.widget.viewport().update(option.rect)  # Repaint the pressed/released button
+        return onButton
+
+    def sizeHint(self, option, index):
+        return self.buttonSize + QSize(10, 4)
+
+
+def loadDataObjects(table, objectArray: list, columnNameFilter: list = None, rowAction=None,
+                    actionDelegate: bool = False) -> None:
+    """Fill table with one row per object; with rowAction, column 0 holds an action button per row.
+
+    actionDelegate=True paints the buttons with an ActionButtonDelegate that
+    calls rowAction(row), instead of creating a QPushButton for every row.
+    """
     # Grab the column names
     firstObject = objectArray[0]
     columnNames = [column.name for column in firstObject.__table__.columns if column.name not in columnNameFilter]
 
     # Set up the table dimensions
     table.setRowCount(len(objectArray))
+    table.clearContents()  # Also removes action buttons left from a load in QPushButton mode
     table.setColumnCount(len(columnNames) + (1 if rowAction else 0))  # Add one column for the action button
 
     # Set the header labels (prepend an empty header for the action button)
@@ -23,9 +90,23 @@ def loadDataObjects(table, objectArray: list, columnNameFilter: list = None, row
         table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)  # Fix Action column
         table.setColumnWidth(0, 70)  # Adjust width as desired
 
+    delegate = getattr(table, "actionDelegate", None)
+    if rowAction and actionDelegate:
+        if delegate is None:
+            delegate = ActionButtonDelegate(rowAction, parent=table)
+            table.setMouseTracking(True)  # Hover highlighting
+        delegate.rowAction = rowAction
+        table.setItemDelegateForColumn(0, delegate)
+        table.actionDelegate = delegate  # Keep the Python object alive with the table
+    elif delegate is not None:
+        # Column 0 holds data or button widgets again
+        table.setItemDelegateForColumn(0, None)
+        table.actionDelegate = None
+
     # Populate the rows
+    columnOffset = 1 if rowAction else 0
     for row, obj in enumerate(objectArray):
-        if rowAction:
+        if rowAction and not actionDelegate:
             # Create the action button
             btn = QPushButton(table)
             btn.setText("Action")  # Optional: Add button text
@@ -36,11 +117,11 @@ def loadDataObjects(table, objectArray: list, columnNameFilter: list = None, row
             # Add the button to the first column
             table.setCellWidget(row, 0, btn)
 
-        # Populate the rest of the columns (shift by 1 because the action button occupies the first column)
+        # Populate the rest of the columns (shift by 1 when the action column occupies the first one)
         for col, columnName in enumerate(columnNames):
             if columnName not in columnNameFilter:
                 item = QTableWidgetItem(str(getattr(obj, columnName)))
-                table.setItem(row, col + 1, item)  # Shift columns by 1
+                table.setItem(row, col + columnOffset, item)
 
 
 # Example usage
@@ -80,7 +161,8 @@ if __name__ == "__main__":
 
     # Load data into the table
     loadDataObjects(
-        tableWidget, objects, columnNameFilter=[], rowAction=lambda row: print(f"Action for row {row}")
+        tableWidget, objects, columnNameFilter=[], rowAction=lambda row: print(f"Action for row {row}"),
+        actionDelegate=True
     )
 
     # Show the table
@@ -0,0 +1,207 @@
+from PyQt6.QtCore import QObject, QThreadPool, QTimer, pyqtSignal
+from sqlalchemy import inspect, text
+
+from queryWorker import QueryWorker
+
+CHANGELOG_TABLE = '_changelog'
+PRUNED_TABLE = '_changelog_pruned'  # Holds the id of the newest entry prune() has deleted
+
+
+class ChangeLog:
+    """Local changelog table filled by triggers on a model's table (SQLite).
+
+    Every insert, update and delete, from any process writing the database
+    file, appends (table, key, op) with an increasing id. An update that
+    changes the key also logs the old key as deleted. Readers keep the last
+    id they have seen as a watermark and only read newer entries; a
+    watermark below horizon() means entries it still needed were pruned.
+    """
+
+    def __init__(self, engine, model_class):
+        if engine.dialect.name != 'sqlite':
+            raise ValueError("The trigger-based changelog needs a SQLite database")
+
+        self.engine = engine
+        self.model_class = model_class
+        self.table_name = model_class.__table__.name
+        self.key_column = inspect(model_class).primary_key[0]
+
+    def create(self):
+        """Create the changelog tables if missing and (re)create this table's triggers."""
+        table, key = self.table_name, self.key_column.name
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {CHANGELOG_TABLE} ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "table_name TEXT NOT NULL, "
+                "row_key, "
+                "op TEXT NOT NULL, "
+                "changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS {CHANGELOG_TABLE}_table_id ON {CHANGELOG_TABLE} (table_name, id)"
+            )
+            conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS {CHANGELOG_TABLE}_changed_at ON {CHANGELOG_TABLE} (changed_at)"
+            )
+            conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {PRUNED_TABLE} (last_id INTEGER PRIMARY KEY)")
+
+            log = f"INSERT INTO {CHANGELOG_TABLE} (table_name, row_key, op)"
+            bodies = {
+                'i': f"{log} VALUES ('{table}', new.{key}, 'I');",
+                # A changed key leaves a row behind under the old key; report that one as deleted
+                'u': f"{log} SELECT '{table}', old.{key}, 'D' WHERE old.{key} IS NOT new.{key}; "
+                     f"{log} VALUES ('{table}', new.{key}, 'U');",
+                'd': f"{log} VALUES ('{table}', old.{key}, 'D');",
+            }
+            for op, event in (('i', 'INSERT'), ('u', 'UPDATE'), ('d', 'DELETE')):
+                # Dropped first so databases logged by an older version get the current triggers
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table}_changelog_{op}")
+                conn.exec_driver_sql(
+                    f"CREATE TRIGGER {table}_changelog_{op} AFTER {event} ON {table} BEGIN {bodies[op]} END"
+                )
+
+    def watermark(self, connection):
+        """Return the id of the newest changelog entry for this table, or the horizon if newer."""
+        newest = connection.execute(
+            text(f"SELECT COALESCE(MAX(id), 0) FROM {CHANGELOG_TABLE} WHERE table_name = :table"),
+            {"table": self.table_name},
+        ).scalar()
+        return max(newest, self.horizon(connection))
+
+    def horizon(self, connection):
+        """Return the id of the newest entry prune() has deleted, 0 if none."""
+        return connection.execute(text(f"SELECT COALESCE(MAX(last_id), 0) FROM {PRUNED_TABLE}")).scalar()
+
+    def changes_since(self, connection, watermark, limit=10000):
+        """Return (id, row key, op) entries newer than watermark, oldest first."""
+        return connection.execute(
+            text(f"SELECT id, row_key, op FROM {CHANGELOG_TABLE} "
+                 "WHERE table_name = :table AND id > :watermark ORDER BY id LIMIT :limit"),
+            {"table": self.table_name, "watermark": watermark, "limit": limit},
+        ).all()
+
+    def prune(self, max_age_days=7):
+        """Delete entries older than max_age_days, moving the horizon up to the newest one deleted."""
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"INSERT OR IGNORE INTO {PRUNED_TABLE} (last_id) "
+                     f"SELECT MAX(id) FROM {CHANGELOG_TABLE} WHERE changed_at < datetime('now', :age) "
+                     "HAVING MAX(id) IS NOT NULL"),
+                {"age": f"-{int(max_age_days)} days"},
+            )
+            horizon = self.horizon(conn)
+            conn.execute(text(f"DELETE FROM {CHANGELOG_TABLE} WHERE id <= :horizon"), {"horizon": horizon})
+            conn.execute(text(f"DELETE FROM {PRUNED_TABLE} WHERE last_id < :horizon"), {"horizon": horizon})
+
+
+class ChangeFeed(QObject):
+    """Poll a ChangeLog in the background and emit the rows that changed.
+
+    Each poll reads the entries past the watermark, collapses them to the
+    last operation per key, and loads only the changed rows. The GUI thread
+    receives (changed instances, removed keys, visible keys) through the
+    changed signal, where visible keys are the changed keys that pass the
+    filters captured by filter_snapshot, or None if every row is visible.
+    Entries older than retention_days are pruned at start and then every
+    prune_interval_ms; if that drops entries past the watermark, reset is
+    emitted instead and the receiver should reload everything.
+    """
+
+    changed = pyqtSignal(object, object, object)  # detached instances, removed primary keys, visible keys
+    reset = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, engine, model_class, interval_ms=2000, retention_days=7, prune_interval_ms=3600000,
+                 parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.model_class = model_class
+        self.changelog = ChangeLog(engine, model_class)
+        self.retention_days = retention_days
+        self.watermark = 0
+        # Optional callable run on the GUI thread as a poll starts; returns None or a
+        # visible_keys(session, keys) function that the worker runs on the changed keys
+        self.filter_snapshot = None
+        self.thread_pool = QThreadPool.globalInstance()
+        self._polling = False
+        self._poll_count = 0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+        self.prune_timer = QTimer(self)
+        self.prune_timer.setInterval(prune_interval_ms)
+        self.prune_timer.timeout.connect(self.prune)
+
+    def start(self):
+        """Begin polling from the current end of the log; call before the initial table load."""
+        self.changelog.create()
+        self.changelog.prune(self.retention_days)
+        with self.engine.connect() as conn:
+            self.watermark = self.changelog.watermark(conn)
+        self.timer.start()
+        self.prune_timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.prune_timer.stop()
+
+    def prune(self):
+        """Prune old entries on the thread pool; other clients' feeds notice through the horizon."""
+        worker = QueryWorker(self.engine, 0, lambda session: self.changelog.prune(self.retention_days))
+        worker.signals.failed.connect(lambda generation, message: self.failed.emit(message))
+        self.thread_pool.start(worker)
+
+    def poll(self):
+        if self._polling:
+            return  # The previous poll is still running
+        self._polling = True
+        self._poll_count += 1
+        visible_keys = self.filter_snapshot() if self.filter_snapshot is not None else None
+        worker = QueryWorker(self.engine, self._poll_count,
+                             lambda session: self._fetch_changes(session, visible_keys))
+        worker.signals.finished.connect(self._on_fetched)
+        worker.signals.failed.connect(self._on_failed)
+        self.thread_pool.start(worker)
+
+    def _fetch_changes(self, session, visible_keys=None):
+        """Runs on the worker thread; returns (new watermark, instances, removed keys, visible keys).
+
+        instances is None when entries past the watermark were pruned, so the
+        changes since then can no longer be told apart from the log.
+        """
+        connection = session.connection()
+        if self.watermark < self.changelog.horizon(connection):
+            return self.changelog.watermark(connection), None, [], None
+
+        entries = self.changelog.changes_since(connection, self.watermark)
+        if not entries:
+            return self.watermark, [], [], None
+
+        last_op = {}
+        for _, row_key, op in entries:
+            last_op[row_key] = op
+        removed = [key for key, op in last_op.items() if op == 'D']
+        upserted = [key for key, op in last_op.items() if op != 'D']
+
+        instances = []
+        key_column = self.changelog.key_column
+        for start in range(0, len(upserted), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = upserted[start:start + 500]
+            instances.extend(session.query(self.model_class).filter(key_column.in_(chunk)).all())
+        visible = visible_keys(session, upserted) if visible_keys is not None and upserted else None
+        return entries[-1][0], instances, removed, visible
+
+    def _on_fetched(self, generation, result):
+        self._polling = False
+        watermark, instances, removed, visible = result
+        self.watermark = watermark
+        if instances is None:
+            self.reset.emit()
+        elif instances or removed:
+            self.changed.emit(instances, removed, visible)
+
+    def _on_failed(self, generation, message):
+        self._polling = False
+        self.failed.emit(message)
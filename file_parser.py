@@ -1,7 +1,13 @@
+import hashlib
 import os
-import re
-import pandas as pd
-import snowflake.connector
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from ingestSinks import SnowflakeSink, SqliteSink
+from sasExtract import DETAIL_COLUMNS, extract
 
 # Config
 folder_path = "./your_folder"  # 👈 Update this
@@ -14,45 +20,196 @@ snowflake_config = {
     "schema": "your_schema"
 }
 target_table = "your_table"  # 👈 Update this
+# One normalized table per kind of extracted detail, e.g. your_table_lul_names (script_name, lul_name)
+detail_tables = {kind: (f"{target_table}_{kind}", columns) for kind, columns in DETAIL_COLUMNS.items()}
+lul_table = detail_tables["lul_names"][0]
+sink_name = "snowflake"  # Or "sqlite" to load into sqlite_path for local development
+sqlite_path = "scripts.db"
+stage_file_format = "csv"  # Chunk format for Snowflake's staged load: "csv" (gzip) or "parquet" (needs pyarrow)
+incremental = True  # Upload only scripts added, changed or deleted since the last run
+manifest_path = "file_parser_manifest.db"  # Local record of what was uploaded; delete it to force a full reload
+batch_size = 500  # Scripts per executemany
+max_batch_bytes = 64 * 1024 * 1024  # Flush a batch early once its code reaches this size
+workers = os.cpu_count() or 1  # Scanner processes; 1 scans in this process
+files_per_task = 32  # Files each worker reads per task, to amortize process round trips
 
-# Regex pattern that handles both ll_name and ll_name01, ll_name02, etc.
-lul_pattern = re.compile(r'%let\s+ll_name\d*\s*=\s*(\w+)\s*;', re.IGNORECASE)
-
-# Collect script info
-rows = []
-for filename in os.listdir(folder_path):
-    full_path = os.path.join(folder_path, filename)
-    if os.path.isfile(full_path):
-        with open(full_path, "r", encoding="utf-8") as file:
-            code = file.read()
-            lul_names = lul_pattern.findall(code)
-            if lul_names:
-                for lul_name in lul_names:
-                    rows.append((filename, code, lul_name))
-            else:
-                # Still include scripts without lul_name, if you want
-                rows.append((filename, code, None))
-
-# Connect to Snowflake
-conn = snowflake.connector.connect(**snowflake_config)
-cs = conn.cursor()
-
-# Optional: create table if not exists
-cs.execute(f"""
-    CREATE TABLE IF NOT EXISTS {target_table} (
-        script_name STRING,
-        code STRING,
-        lul_name STRING
+
+def iter_script_files(folder_path):
+    """Yield (script_name, full_path) for every file under folder_path, in a stable order.
+
+    script_name is the path relative to folder_path, so top-level files keep
+    their bare filename.
+    """
+    stack = [folder_path]
+    while stack:
+        directory = stack.pop()
+        subdirectories = []
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file():
+                    yield os.path.relpath(entry.path, folder_path), entry.path
+        stack.extend(reversed(subdirectories))  # Depth-first, alphabetical
+
+
+def scan_file(script_file):
+    """Read one script and extract its details; runs in the worker processes."""
+    script_name, full_path = script_file
+    with open(full_path, "r", encoding="utf-8") as file:
+        code = file.read()
+    return script_name, code, extract(code)
+
+
+def scan_changed_file(script_file):
+    """scan_file plus the new manifest entry (mtime_ns, size, sha256) for the file."""
+    script_name, full_path, mtime_ns, size = script_file
+    script_name, code, details = scan_file((script_name, full_path))
+    digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    return script_name, code, details, (mtime_ns, size, digest)
+
+
+def scan_files(script_files, scan=scan_file):
+    return [scan(script_file) for script_file in script_files]
+
+
+def iter_chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(executor, fn, items, window):
+    """Like executor.map, but with at most window tasks in flight so finished results never pile up."""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def scan_script_files(script_files, workers=1, scan=scan_file):
+    """Yield scan(script_file) for each script file, in order, across worker processes."""
+    if workers <= 1:
+        yield from map(scan, script_files)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = iter_chunks(script_files, files_per_task)
+        for scanned in ordered_map(executor, partial(scan_files, scan=scan), chunks, window=workers * 2):
+            yield from scanned
+
+
+def iter_scripts(folder_path, workers=1):
+    """Yield (script_name, code, details) in directory order, scanning across worker processes."""
+    return scan_script_files(iter_script_files(folder_path), workers)
+
+
+def open_manifest(path):
+    manifest = sqlite3.connect(path)
+    manifest.execute(
+        "CREATE TABLE IF NOT EXISTS manifest ("
+        "script_name TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT)"
     )
-""")
+    return manifest
+
+
+def read_manifest(manifest):
+    """Return {script_name: (mtime_ns, size, sha256)} as of the last successful upload."""
+    rows = manifest.execute("SELECT script_name, mtime_ns, size, sha256 FROM manifest")
+    return {script_name: (mtime_ns, size, digest) for script_name, mtime_ns, size, digest in rows}
+
+
+def iter_changed_scripts(script_files, known, entries, workers=1):
+    """Yield (script_name, code, details) for the script_files that are new or whose content changed.
+
+    script_files are (script_name, full_path) pairs from iter_script_files.
+    Files whose mtime and size match their entry in known are not read at all;
+    the rest are hashed in the workers, and a file that was only touched is
+    not yielded. entries receives the manifest entry of every file found.
+    """
+    def stat_changed():
+        for script_name, full_path in script_files:
+            stat = os.stat(full_path)
+            entry = known.get(script_name)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                entries[script_name] = entry
+            else:
+                yield script_name, full_path, stat.st_mtime_ns, stat.st_size
+
+    for script_name, code, details, entry in scan_script_files(stat_changed(), workers, scan_changed_file):
+        entries[script_name] = entry
+        previous = known.get(script_name)
+        if previous is None or previous[2] != entry[2]:
+            yield script_name, code, details
+
+
+def sync_scripts(sink, manifest, workers=1):
+    """Bring the sink up to date with folder_path, touching only what changed.
+
+    The manifest is only updated once the sink has committed, so a failed
+    run is simply retried in full next time.
+    Returns (changed script count, deleted script count, {kind: detail row count}).
+    """
+    known = read_manifest(manifest)
+    entries = {}
+    changed_scripts = iter_changed_scripts(iter_script_files(folder_path), known, entries, workers)
+    # Deletions are only known once every file has been seen, i.e. after changed_scripts is consumed
+    counts = sink.sync(changed_scripts, lambda: sorted(known.keys() - entries.keys()))
+
+    # The sink now matches the folder; record that locally
+    write_manifest(manifest, known, entries)
+    return counts
+
+
+def write_manifest(manifest, known, entries):
+    """Replace the manifest's known entries with the entries of the files just synced."""
+    with manifest:
+        manifest.executemany("DELETE FROM manifest WHERE script_name = ?",
+                             [(script_name,) for script_name in known.keys() - entries.keys()])
+        manifest.executemany("INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?)",
+                             [(script_name, *entry) for script_name, entry in entries.items()
+                              if known.get(script_name) != entry])
+
+
+def open_sink(name=sink_name, batch_size=batch_size, sqlite_path=sqlite_path):
+    if name == "sqlite":
+        return SqliteSink(sqlite3.connect(sqlite_path), target_table, detail_tables, batch_size, max_batch_bytes)
+
+    import snowflake.connector  # Only the Snowflake sink needs the connector installed
+    connection = snowflake.connector.connect(**snowflake_config)
+    return SnowflakeSink(connection, target_table, detail_tables, file_format=stage_file_format)
+
+
+def main():
+    sink = open_sink()
+    try:
+        # Optional: create tables if not exists
+        sink.create_tables()
+
+        if incremental:
+            manifest = open_manifest(manifest_path)
+            try:
+                changed_count, deleted_count, detail_counts = sync_scripts(sink, manifest, workers)
+            finally:
+                manifest.close()
+            print(f"Synced {target_table} ({sink_name}): {changed_count} scripts added or changed, "
+                  f"{deleted_count} deleted, {detail_counts.get('lul_names', 0)} lul_names uploaded.")
+        else:
+            # Stream scripts from disk straight into the sink's bulk load
+            script_count, detail_counts = sink.append(iter_scripts(folder_path, workers))
 
-# Insert data
-insert_sql = f"INSERT INTO {target_table} (script_name, code, lul_name) VALUES (%s, %s, %s)"
-cs.executemany(insert_sql, rows)
+            # Confirm upload
+            print(f"Uploaded {script_count} scripts to {target_table} and "
+                  f"{detail_counts.get('lul_names', 0)} lul_names to {lul_table} ({sink_name}).")
+    finally:
+        sink.close()
 
-# Confirm upload
-print(f"Uploaded {len(rows)} rows to {target_table} in Snowflake.")
 
-# Cleanup
-cs.close()
-conn.close()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from collections import namedtuple
+from datetime import date, datetime, time
+
+from sqlalchemy import inspect
+
+# kind is one of 'options', 'int', 'float', 'bool', 'date', 'time', 'datetime', 'text'
+FieldSpec = namedtuple('FieldSpec', ['name', 'label', 'kind', 'options', 'editable'])
+
+_spec_cache = {}
+
+_KINDS = {
+    int: 'int',
+    float: 'float',
+    bool: 'bool',
+    date: 'date',
+    time: 'time',
+    datetime: 'datetime',
+}
+
+
+def _field_kind(model_class, column):
+    if hasattr(model_class, f"{column.name}_options"):
+        return 'options'
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return 'text'
+    return _KINDS.get(python_type, 'text')
+
+
+def compile_form_spec(model_class, included_columns=None, editable_fields=None):
+    """Return the FieldSpecs for a form over model_class, reflecting the model only once.
+
+    included_columns=None includes every column and editable_fields=None makes
+    every field editable. Specs are cached per model and column selection, so
+    building the same form again (e.g. another duplicated section) is a
+    dictionary lookup.
+    """
+    key = (
+        model_class,
+        None if included_columns is None else tuple(included_columns),
+        None if editable_fields is None else tuple(editable_fields),
+    )
+    spec = _spec_cache.get(key)
+    if spec is None:
+        spec = tuple(
+            FieldSpec(
+                name=column.name,
+                label=column.name.capitalize(),
+                kind=_field_kind(model_class, column),
+                options=tuple(getattr(model_class, f"{column.name}_options", ())),
+                editable=editable_fields is None or column.name in editable_fields,
+            )
+            for column in inspect(model_class).c
+            if included_columns is None or column.name in included_columns
+        )
+        _spec_cache[key] = spec
+    return spec
+
+
+def invalidate_form_spec(model_class=None):
+    """Drop cached specs for model_class, or all specs, e.g. after its *_options change."""
+    for key in list(_spec_cache):
+        if model_class is None or key[0] is model_class:
+            del _spec_cache[key]
@@ -0,0 +1,100 @@
+from sqlalchemy import Float, Integer, inspect, literal_column, text
+
+from searchIndex import is_text_column
+
+
+class FullTextIndex:
+    """SQLite FTS5 shadow table over a model's text columns.
+
+    The FTS table uses the model's table as external content, so it only
+    stores the inverted index. Triggers on the model table keep it in sync
+    with every insert, update and delete, including ModelForm.submit_form.
+
+    tokenizer='unicode61' matches word prefixes; tokenizer='trigram' (SQLite
+    3.34+) matches arbitrary substrings like the ilike filter does.
+    """
+
+    def __init__(self, engine, model_class, columns=None, tokenizer='unicode61'):
+        if engine.dialect.name != 'sqlite':
+            raise ValueError("FTS5 full-text search needs a SQLite database")
+
+        self.engine = engine
+        self.model_class = model_class
+        self.table_name = model_class.__table__.name
+        self.fts_name = f"{self.table_name}_fts"
+        self.tokenizer = tokenizer
+
+        mapper_columns = inspect(model_class).c
+        self.columns = columns or [column.name for column in mapper_columns if is_text_column(column)]
+
+        # FTS5 addresses content rows by an integer rowid; use the pk when it is one
+        key = inspect(model_class).primary_key[0]
+        try:
+            integer_key = key.type.python_type is int
+        except NotImplementedError:
+            integer_key = False
+        self.content_rowid = key.name if integer_key else 'rowid'
+        self.rowid_column = key if integer_key else literal_column(f'"{self.table_name}".rowid')
+
+    def create(self):
+        """Create the FTS table and its sync triggers if missing, indexing existing rows once."""
+        cols = ", ".join(self.columns)
+        new_cols = ", ".join(f"new.{col}" for col in self.columns)
+        old_cols = ", ".join(f"old.{col}" for col in self.columns)
+        fts, table, rowid = self.fts_name, self.table_name, self.content_rowid
+
+        with self.engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+            ).first()
+
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{cols}, content='{table}', content_rowid='{rowid}', tokenize='{self.tokenizer}')"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_cols}); END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_cols}); END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_cols}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_cols}); END"
+            )
+
+            if not exists:
+                conn.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def rebuild(self):
+        """Re-index every row, e.g. after rows were written with triggers disabled."""
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"INSERT INTO {self.fts_name}({self.fts_name}) VALUES ('rebuild')")
+
+    def match_expression(self, search_text):
+        """Turn free text into an FTS5 query; every word must match."""
+        words = search_text.split()
+        if self.tokenizer == 'trigram':
+            # Trigram tokens match substrings directly; words shorter than 3 chars cannot match
+            words = [word for word in words if len(word) >= 3]
+            return " ".join('"{}"'.format(word.replace('"', '""')) for word in words)
+        return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+    def can_match(self, search_text):
+        return bool(self.match_expression(search_text))
+
+    def match(self, query, search_text, ranked=True):
+        """Restrict query to rows matching search_text, best bm25 rank first when ranked."""
+        matches = (
+            text(f"SELECT rowid, rank FROM {self.fts_name} WHERE {self.fts_name} MATCH :match")
+            .bindparams(match=self.match_expression(search_text))
+            .columns(rowid=Integer, rank=Float)
+            .subquery("fts_match")
+        )
+        query = query.join(matches, self.rowid_column == matches.c.rowid)
+        if ranked:
+            query = query.order_by(matches.c.rank)
+        return query
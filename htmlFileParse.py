@@ -1,61 +1,518 @@
+import hashlib
+import json
 import os
+import sqlite3
+import tempfile
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import chain
+
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from ruleWriters import WRITERS, output_format
+
+CHUNK_SIZE = 1024 * 1024  # Bytes fed to the streaming parser at a time
+FILES_PER_TASK = 32  # Most reports a worker process parses per round trip
+CACHE_PATH = 'html_rules_cache.db'  # Parsed rules of every report seen so far; delete it to reparse everything
+OUTPUT_PATH = 'output_rules.xlsx'  # .xlsx, .csv, .parquet or a database URL such as sqlite:///rules.db
+ASCII_SPACES = ' \n\t\f\r'
+
+# Columns every rule has; its dt/dd attributes are sparse and go to a (Rule Id, Key, Value) table
+RULE_COLUMNS = ('Rule Name', 'Rule Logic')
+
+# One file's rules in column form; rule_ids index into the columns
+RuleChunk = namedtuple('RuleChunk', ['columns', 'rule_ids', 'keys', 'values', 'key_order'])
+
+
+def parse_rules_soup(file_path):
+    """Return one dict per rule anchor, searching a full BeautifulSoup tree."""
+    rules_data = []
+
+    # Parse the HTML file
+    with open(file_path, 'r', encoding='utf-8') as file:
+        soup = BeautifulSoup(file, 'lxml')
+
+    # Find all rules by their anchor tags
+    rules = soup.find_all('a', attrs={'name': True})
+
+    for rule in rules:
+        rule_data = {}
+
+        # Rule Name (e.g., rule1, rule2)
+        rule_data['Rule Name'] = rule.text.strip() if rule.text else None
+
+        # Find associated blockquote and parse details
+        blockquote = rule.find_next('blockquote')
+        if blockquote:
+            # Extract text from <PRE> tags for rule logic
+            pre = blockquote.find('pre')
+            if pre:
+                rule_data['Rule Logic'] = pre.text.strip()
+
+            # Extract additional details from <dl> if available
+            details = blockquote.find_next('dl')
+            if details:
+                for dt, dd in zip(details.find_all('dt'), details.find_all('dd')):
+                    key = dt.text.strip() if dt else None
+                    value = dd.text.strip() if dd else None
+                    if key and value:
+                        rule_data[key] = value
+
+        rules_data.append(rule_data)
+
+    return rules_data
+
+
+class _Rule:
+    __slots__ = ('name', 'logic', 'details')
+
+    def __init__(self):
+        self.name = None
+        self.logic = None  # None until a <pre> is found
+        self.details = {}
+
+    def as_dict(self):
+        rule_data = {'Rule Name': self.name}
+        if self.logic is not None:
+            rule_data['Rule Logic'] = self.logic
+        rule_data.update(self.details)
+        return rule_data
+
+
+class RuleTarget:
+    """lxml parser target that finds the same rules as parse_rules_soup in one pass over the events.
+
+    find_next() becomes waiting lists: anchors wait for the next <blockquote>
+    to start, blockquotes wait for their first <pre> until they close, and
+    rules whose blockquote has started wait for the next <dl>. Element text is
+    only collected while it is still needed, so no tree is ever built.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self.depth = 0
+        self.captures = []  # Open text captures: [depth, text parts, on_done]
+        self.pending_text = []
+        self.preserve_depth = 0  # Open <pre>/<textarea> elements
+        self.waiting_for_blockquote = []
+        self.pre_searches = []  # (blockquote depth, rules) still looking for their first <pre>
+        self.waiting_for_dl = []
+        self.open_dls = []  # (dl depth, rules, dt texts, dd texts)
+
+    def _capture(self, on_done):
+        self.captures.append([self.depth, [], on_done])
 
-def parse_html_to_dataframe(folder_path):
-    # List to store all extracted rule data
-    all_rules = []
+    def _flush_text(self):
+        """Hand the text since the last tag to the open captures, as one string like BeautifulSoup's."""
+        if not self.pending_text:
+            return
+        text = ''.join(self.pending_text)
+        self.pending_text = []
+        if not self.preserve_depth and not text.strip(ASCII_SPACES):
+            # BeautifulSoup collapses whitespace-only strings outside <pre> and <textarea>
+            text = '\n' if '\n' in text else ' '
+        for capture in self.captures:
+            capture[1].append(text)
 
-    # Loop through each HTML file in the folder
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith('.html'):
-            file_path = os.path.join(folder_path, file_name)
+    def start(self, tag, attrib):
+        self._flush_text()
+        self.depth += 1
+        if tag == 'pre' or tag == 'textarea':
+            self.preserve_depth += 1
+        if tag == 'a' and 'name' in attrib:
+            rule = _Rule()
+            self.rules.append(rule)
+            self.waiting_for_blockquote.append(rule)
 
-            # Parse the HTML file
-            with open(file_path, 'r', encoding='utf-8') as file:
-                soup = BeautifulSoup(file, 'lxml')
+            def set_name(text, rule=rule):
+                rule.name = text.strip() if text else None
+            self._capture(set_name)
 
-                # Find all rules by their anchor tags
-                rules = soup.find_all('a', attrs={'name': True})
+        elif tag == 'blockquote' and self.waiting_for_blockquote:
+            rules, self.waiting_for_blockquote = self.waiting_for_blockquote, []
+            self.pre_searches.append((self.depth, rules))
+            self.waiting_for_dl.extend(rules)
 
+        elif tag == 'pre' and self.pre_searches:
+            rules = [rule for _, searching in self.pre_searches for rule in searching]
+            self.pre_searches = []
+
+            def set_logic(text, rules=rules):
                 for rule in rules:
-                    rule_data = {}
+                    rule.logic = text.strip()
+            self._capture(set_logic)
+
+        elif tag == 'dt' or tag == 'dd':
+            for _, _, dts, dds in self.open_dls:
+                texts = dts if tag == 'dt' else dds
+                texts.append(None)
+                index = len(texts) - 1
+
+                def set_text(text, texts=texts, index=index):
+                    texts[index] = text
+                self._capture(set_text)
+
+        if tag == 'dl' and self.waiting_for_dl:
+            rules, self.waiting_for_dl = self.waiting_for_dl, []
+            self.open_dls.append((self.depth, rules, [], []))
+
+    def end(self, tag):
+        self._flush_text()
+        if tag == 'pre' or tag == 'textarea':
+            self.preserve_depth -= 1
+
+        while self.captures and self.captures[-1][0] == self.depth:
+            _, parts, on_done = self.captures.pop()
+            on_done(''.join(parts))
+
+        if self.pre_searches and self.pre_searches[-1][0] == self.depth:
+            self.pre_searches.pop()  # The blockquote closed without a <pre>
+
+        if self.open_dls and self.open_dls[-1][0] == self.depth:
+            _, rules, dts, dds = self.open_dls.pop()
+            for dt, dd in zip(dts, dds):
+                key = dt.strip()
+                value = dd.strip()
+                if key and value:
+                    for rule in rules:
+                        rule.details[key] = value
+
+        self.depth -= 1
+
+    def data(self, text):
+        if self.captures:
+            self.pending_text.append(text)
+
+    def comment(self, text):
+        self._flush_text()
+
+    def close(self):
+        self._flush_text()
+        return [rule.as_dict() for rule in self.rules]
+
+
+def parse_rules_lxml(file_path):
+    """Return the same dicts as parse_rules_soup, streaming the file through lxml's HTML parser."""
+    parser = etree.HTMLParser(target=RuleTarget(), encoding='utf-8')
+    with open(file_path, 'rb') as file:
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    return parser.close()
+
+
+PARSERS = {'soup': parse_rules_soup, 'lxml': parse_rules_lxml}
+
+
+def parse_file_chunk(task):
+    """Parse one (file_path, engine) task into a RuleChunk; runs in the worker processes."""
+    file_path, engine = task
+    columns = {column: [] for column in RULE_COLUMNS}
+    rule_ids, keys, values = [], [], []
+    key_order = {}
+
+    for rule_id, rule_data in enumerate(PARSERS[engine](file_path)):
+        key_order.update(dict.fromkeys(rule_data))
+        for column in RULE_COLUMNS:
+            columns[column].append(rule_data.get(column))
+        for key, value in rule_data.items():
+            if key not in columns:
+                rule_ids.append(rule_id)
+                keys.append(key)
+                values.append(value)
+
+    return RuleChunk(columns, rule_ids, keys, values, tuple(key_order))
+
+
+def html_files(folder_path):
+    return [os.path.join(folder_path, file_name)
+            for file_name in os.listdir(folder_path) if file_name.endswith('.html')]
+
+
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_chunks(folder_path, engine='lxml', workers=1):
+    """Return a RuleChunk per HTML file in folder_path, parsing files across worker processes."""
+    return list(map_chunks(html_files(folder_path), engine, workers))
+
+
+def parse_file_chunks(tasks):
+    return [parse_file_chunk(task) for task in tasks]
+
+
+def map_chunks(file_paths, engine='lxml', workers=1):
+    """Yield a RuleChunk per file, in file order, parsing across worker processes.
+
+    Only two batches per worker are in flight at a time, so parsed chunks
+    never pile up faster than the caller consumes them.
+    """
+    tasks = [(file_path, engine) for file_path in file_paths]
+    if workers <= 1 or len(tasks) <= 1:  # Not worth starting processes for
+        yield from map(parse_file_chunk, tasks)
+        return
+
+    # Several files per round trip, but not so many that one batch holds much of the corpus
+    files_per_task = max(1, min(FILES_PER_TASK, len(tasks) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start in range(0, len(tasks), files_per_task):
+            pending.append(executor.submit(parse_file_chunks, tasks[start:start + files_per_task]))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class RuleCache:
+    """SQLite store of parsed reports, keyed by file path and content hash.
+
+    Each file's RuleChunk is kept as rows: its rules, its sparse attributes
+    and its key order, so unchanged reports never need parsing again.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT, key_order TEXT
+            );
+            CREATE TABLE IF NOT EXISTS rules (
+                path TEXT, rule_id INTEGER, rule_name TEXT, rule_logic TEXT, PRIMARY KEY (path, rule_id)
+            );
+            CREATE TABLE IF NOT EXISTS attributes (path TEXT, rule_id INTEGER, key TEXT, value TEXT);
+            CREATE INDEX IF NOT EXISTS attributes_path ON attributes (path);
+        """)
+
+    def entries(self):
+        """Return {path: (mtime_ns, size, sha256)} for every cached file."""
+        rows = self.connection.execute("SELECT path, mtime_ns, size, sha256 FROM files")
+        return {path: (mtime_ns, size, digest) for path, mtime_ns, size, digest in rows}
+
+    def update_stat(self, path, entry):
+        self.connection.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", (*entry[:2], path))
+
+    def store(self, path, entry, chunk):
+        self.remove([path])
+        self.connection.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                                (path, *entry, json.dumps(chunk.key_order)))
+        self.connection.executemany(
+            "INSERT INTO rules VALUES (?, ?, ?, ?)",
+            [(path, rule_id, *values) for rule_id, values in
+             enumerate(zip(*(chunk.columns[column] for column in RULE_COLUMNS)))],
+        )
+        self.connection.executemany(
+            "INSERT INTO attributes VALUES (?, ?, ?, ?)",
+            [(path, *row) for row in zip(chunk.rule_ids, chunk.keys, chunk.values)],
+        )
+
+    def remove(self, paths):
+        for table in ('files', 'rules', 'attributes'):
+            self.connection.executemany(f"DELETE FROM {table} WHERE path = ?", [(path,) for path in paths])
+
+    def load(self, path):
+        """Return the cached RuleChunk for path."""
+        (key_order,), = self.connection.execute("SELECT key_order FROM files WHERE path = ?", (path,))
+        rows = self.connection.execute(
+            "SELECT rule_name, rule_logic FROM rules WHERE path = ? ORDER BY rule_id", (path,)
+        ).fetchall()
+        columns = {column: [row[i] for row in rows] for i, column in enumerate(RULE_COLUMNS)}
+        attributes = self.connection.execute(
+            "SELECT rule_id, key, value FROM attributes WHERE path = ? ORDER BY rowid", (path,)
+        ).fetchall()
+        rule_ids, keys, values = (list(column) for column in zip(*attributes)) if attributes else ([], [], [])
+        return RuleChunk(columns, rule_ids, keys, values, tuple(json.loads(key_order)))
+
+    def key_order(self, paths):
+        """Return every column name of the cached files at paths in order of first appearance, without their rules."""
+        key_orders = dict(self.connection.execute("SELECT path, key_order FROM files"))
+        return list(dict.fromkeys(chain.from_iterable(json.loads(key_orders[path]) for path in paths)))
+
+    def close(self):
+        self.connection.close()
+
+
+@contextmanager
+def open_rule_cache(cache_path=None):
+    """Yield the RuleCache at cache_path, or with None a temporary one that is deleted afterwards."""
+    with tempfile.TemporaryDirectory() if cache_path is None else nullcontext() as temp_dir:
+        cache = RuleCache(cache_path or os.path.join(temp_dir, 'rules.db'))
+        try:
+            yield cache
+        finally:
+            cache.close()
+
+
+def update_cache(file_paths, cache, engine='lxml', workers=1):
+    """Parse the reports that are new or changed since they were cached, and return file_paths as cache keys.
+
+    Files whose mtime and size match the cache are not read; the rest are
+    hashed, and only those whose content changed are parsed. Each chunk is
+    stored as soon as it is parsed, so the parsed corpus is never held in
+    memory. Cached reports missing from file_paths are dropped from the cache.
+    """
+    file_paths = [os.path.abspath(file_path) for file_path in file_paths]
+    known = cache.entries()
+    to_parse = {}
+    with cache.connection:
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            entry = known.get(file_path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                continue
+            digest = file_hash(file_path)
+            if entry is not None and entry[2] == digest:
+                cache.update_stat(file_path, (stat.st_mtime_ns, stat.st_size))  # Touched, not changed
+            else:
+                to_parse[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+
+        for file_path, chunk in zip(to_parse, map_chunks(to_parse, engine, workers)):
+            cache.store(file_path, to_parse[file_path], chunk)
+        cache.remove(known.keys() - set(file_paths))
+
+    return file_paths
+
+
+def parse_chunks_cached(file_paths, cache, engine='lxml', workers=1):
+    """Like map_chunks, but only parse reports that are new or changed since they were cached (see update_cache)."""
+    return [cache.load(file_path) for file_path in update_cache(file_paths, cache, engine, workers)]
+
+
+def combine_chunks(chunks):
+    """Concatenate chunks once into (rules, attributes, key order).
+
+    rules has the RULE_COLUMNS for every rule, and attributes the sparse
+    (Rule Id, Key, Value) rows, where Rule Id is the row in rules. Key order
+    is every column name in order of first appearance.
+    """
+    rule_columns = {
+        column: list(chain.from_iterable(chunk.columns[column] for chunk in chunks))
+        for column in RULE_COLUMNS
+    }
+    # A rule without a <pre> has no 'Rule Logic' at all, which pd.DataFrame(list of dicts) shows as NaN
+    rule_columns['Rule Logic'] = [np.nan if logic is None else logic for logic in rule_columns['Rule Logic']]
+    rules = pd.DataFrame(rule_columns)
+
+    rule_ids = []
+    offset = 0
+    for chunk in chunks:
+        rule_ids.extend(rule_id + offset for rule_id in chunk.rule_ids)
+        offset += len(chunk.columns[RULE_COLUMNS[0]])
+    attributes = pd.DataFrame({
+        'Rule Id': rule_ids,
+        'Key': list(chain.from_iterable(chunk.keys for chunk in chunks)),
+        'Value': list(chain.from_iterable(chunk.values for chunk in chunks)),
+    })
+
+    return rules, attributes, chunk_key_order(chunks)
+
+
+def chunk_key_order(chunks):
+    return list(dict.fromkeys(chain.from_iterable(chunk.key_order for chunk in chunks)))
+
+
+def iter_rule_rows(chunks, key_order):
+    """Yield a batch of wide rows per chunk, with a value or None for every column in key_order."""
+    positions = {key: i for i, key in enumerate(key_order)}
+    for chunk in chunks:
+        rows = [[None] * len(key_order) for _ in chunk.columns[RULE_COLUMNS[0]]]
+        for column in RULE_COLUMNS:
+            if column in positions:
+                position = positions[column]
+                for row, value in zip(rows, chunk.columns[column]):
+                    row[position] = value
+        for rule_id, key, value in zip(chunk.rule_ids, chunk.keys, chunk.values):
+            rows[rule_id][positions[key]] = value
+        yield rows
+
+
+def write_rules(chunks, key_order, writer):
+    """Stream the wide rule table to a ruleWriters.RuleWriter, one chunk's rows at a time.
+
+    chunks can be a generator; key_order must hold every key they contain.
+    If parsing or writing fails, the writer is aborted instead of closed.
+    """
+    try:
+        writer.open(key_order)
+        for rows in iter_rule_rows(chunks, key_order):
+            writer.write_rows(rows)
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def write_cached_rules(cache, file_paths, writer):
+    """Stream the cached rules of file_paths to writer, loading one file at a time; returns the rule count."""
+    rule_count = 0
+
+    def chunks():
+        nonlocal rule_count
+        for file_path in file_paths:
+            chunk = cache.load(file_path)
+            rule_count += len(chunk.columns[RULE_COLUMNS[0]])
+            yield chunk
+
+    write_rules(chunks(), cache.key_order(file_paths), writer)
+    return rule_count
+
+
+def widen(rules, attributes, key_order):
+    """Return one row per rule with a column per attribute key, like pd.DataFrame(list of rule dicts)."""
+    wide = attributes.pivot(index='Rule Id', columns='Key', values='Value')
+    wide.columns.name = None
+    return rules.join(wide).reindex(columns=key_order)
+
 
-                    # Rule Name (e.g., rule1, rule2)
-                    rule_data['Rule Name'] = rule.text.strip() if rule.text else None
+def parse_html_to_dataframe(folder_path, engine='lxml', workers=1, cache_path=None):
+    """engine='lxml' streams each file in one linear pass; 'soup' builds a BeautifulSoup tree per file.
 
-                    # Find associated blockquote and parse details
-                    blockquote = rule.find_next('blockquote')
-                    if blockquote:
-                        # Extract text from <PRE> tags for rule logic
-                        pre = blockquote.find('pre')
-                        if pre:
-                            rule_data['Rule Logic'] = pre.text.strip()
+    With cache_path, parsed reports are kept in a RuleCache there and only
+    new or changed reports are parsed.
+    """
+    if cache_path is None:
+        return widen(*combine_chunks(parse_chunks(folder_path, engine, workers)))
 
-                        # Extract additional details from <dl> if available
-                        details = blockquote.find_next('dl')
-                        if details:
-                            for dt, dd in zip(details.find_all('dt'), details.find_all('dd')):
-                                key = dt.text.strip() if dt else None
-                                value = dd.text.strip() if dd else None
-                                if key and value:
-                                    rule_data[key] = value
+    cache = RuleCache(cache_path)
+    try:
+        return widen(*combine_chunks(parse_chunks_cached(html_files(folder_path), cache, engine, workers)))
+    finally:
+        cache.close()
 
-                    # Append to all_rules
-                    all_rules.append(rule_data)
 
-    # Convert list of rules to a DataFrame
-    df = pd.DataFrame(all_rules)
+def export_rules(folder_path, output_path=OUTPUT_PATH, output_kind=None, engine='lxml', workers=1,
+                 cache_path=None):
+    """Parse folder_path and stream the rules to output_path, without building a DataFrame.
 
-    return df
+    Each report's chunk goes into the RuleCache at cache_path, or a temporary
+    one, as soon as it is parsed. The column order then comes from the cache,
+    and the rules are read back and written one report at a time, so memory
+    holds one report's rules rather than the corpus. output_kind is a key of
+    ruleWriters.WRITERS, guessed from output_path when not given. Returns the
+    number of rules written.
+    """
+    writer = WRITERS[output_kind or output_format(output_path)](output_path)
+    with open_rule_cache(cache_path) as cache:
+        file_paths = update_cache(html_files(folder_path), cache, engine, workers)
+        return write_cached_rules(cache, file_paths, writer)
 
-# Define the folder path containing the HTML files
-folder_path = 'path_to_your_folder'
 
-# Parse the files and create a DataFrame
-df = parse_html_to_dataframe(folder_path)
+if __name__ == '__main__':
+    # Define the folder path containing the HTML files
+    folder_path = 'path_to_your_folder'
 
-# Save the DataFrame to an Excel file
-df.to_excel('output_rules.xlsx', index=False)
+    # Parse the files and stream the rules to the output file
+    export_rules(folder_path, OUTPUT_PATH, workers=os.cpu_count() or 1, cache_path=CACHE_PATH)
 
-print("Data parsing complete. Saved as 'output_rules.xlsx'.")
+    print(f"Data parsing complete. Saved as '{OUTPUT_PATH}'.")
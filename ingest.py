@@ -0,0 +1,199 @@
+"""Run the SAS script and HTML rule ingestion with command-line options.
+
+    python ingest.py sas ./scripts --sink sqlite --workers 8 --profile
+    python ingest.py html ./reports --output rules.parquet --until parse --profile
+
+Each run goes through three stages: scan (find the files), parse (read and
+extract them) and load (upload or write the results). --until stops after
+an earlier stage, e.g. to measure parsing without touching the warehouse.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+STAGES = ('scan', 'parse', 'load')
+
+
+class Profile:
+    """Wall time per stage, not counting time spent in stages nested inside it, plus files and bytes scanned."""
+
+    def __init__(self, count_bytes=False):
+        self.count_bytes = count_bytes
+        self.seconds = defaultdict(float)
+        self.files = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self._nested = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.seconds[name] += elapsed - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def timed(self, name, iterable):
+        """Yield from iterable, charging the time spent producing each item to stage name."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def counted(self, paths, path=lambda item: item):
+        """Yield paths, counting files and, with count_bytes, their sizes."""
+        for item in paths:
+            self.files += 1
+            if self.count_bytes:
+                self.bytes += os.stat(path(item)).st_size
+            yield item
+
+    def report(self, out=sys.stderr):
+        total = time.perf_counter() - self.started
+        megabytes = self.bytes / 1024 / 1024
+        print(f"{'stage':<8}{'seconds':>10}{'files/s':>12}{'MB/s':>10}", file=out)
+        for name in STAGES + ('total',):
+            seconds = total if name == 'total' else self.seconds.get(name)
+            if seconds is None:
+                continue
+            files_rate = self.files / seconds if seconds else 0.0
+            bytes_rate = megabytes / seconds if seconds else 0.0
+            print(f"{name:<8}{seconds:>10.3f}{files_rate:>12.1f}{bytes_rate:>10.2f}", file=out)
+        print(f"{self.files} files, {megabytes:.2f} MB", file=out)
+
+
+def consume(iterable):
+    for _ in iterable:
+        pass
+
+
+def run_sas(args):
+    import file_parser
+
+    profile = Profile(count_bytes=args.profile)
+
+    folder_path = args.folder or file_parser.folder_path
+    script_files = profile.counted(file_parser.iter_script_files(folder_path), path=lambda item: item[1])
+    script_files = profile.timed('scan', script_files)
+    if args.until == 'scan':
+        consume(script_files)
+        return profile
+
+    if args.full:
+        scripts = profile.timed('parse', file_parser.scan_script_files(script_files, args.workers))
+        if args.until == 'parse':
+            consume(scripts)
+            return profile
+        sink = file_parser.open_sink(args.sink, args.batch_size, args.sqlite_path)
+        try:
+            sink.create_tables()
+            with profile.stage('load'):
+                script_count, detail_counts = sink.append(scripts)
+        finally:
+            sink.close()
+        print(f"Uploaded {script_count} scripts and {detail_counts.get('lul_names', 0)} lul_names ({args.sink}).")
+        return profile
+
+    manifest = file_parser.open_manifest(args.manifest)
+    try:
+        known = file_parser.read_manifest(manifest)
+        entries = {}
+        scripts = file_parser.iter_changed_scripts(script_files, known, entries, args.workers)
+        scripts = profile.timed('parse', scripts)
+        if args.until == 'parse':
+            consume(scripts)  # The manifest is left alone: nothing was loaded
+            return profile
+        sink = file_parser.open_sink(args.sink, args.batch_size, args.sqlite_path)
+        try:
+            sink.create_tables()
+            with profile.stage('load'):
+                changed_count, deleted_count, detail_counts = sink.sync(
+                    scripts, lambda: sorted(known.keys() - entries.keys())
+                )
+        finally:
+            sink.close()
+        file_parser.write_manifest(manifest, known, entries)
+    finally:
+        manifest.close()
+    print(f"Synced ({args.sink}): {changed_count} scripts added or changed, {deleted_count} deleted, "
+          f"{detail_counts.get('lul_names', 0)} lul_names uploaded.")
+    return profile
+
+
+def run_html(args):
+    import htmlFileParse
+    from ruleWriters import WRITERS, output_format
+
+    profile = Profile(count_bytes=args.profile)
+
+    with profile.stage('scan'):
+        file_paths = list(profile.counted(htmlFileParse.html_files(args.folder)))
+    if args.until == 'scan':
+        return profile
+
+    # Parsed chunks go straight into the cache; the load stage streams them back out one report at a time
+    with htmlFileParse.open_rule_cache(None if args.no_cache else args.cache) as cache:
+        with profile.stage('parse'):
+            file_paths = htmlFileParse.update_cache(file_paths, cache, args.engine, args.workers)
+        if args.until == 'parse':
+            return profile
+
+        with profile.stage('load'):
+            writer = WRITERS[args.format or output_format(args.output)](args.output)
+            rule_count = htmlFileParse.write_cached_rules(cache, file_paths, writer)
+    print(f"Wrote {rule_count} rules to '{args.output}'.")
+    return profile
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes for parsing; 1 parses in this process (default: CPU count)")
+    common.add_argument('--until', choices=STAGES, default='load', help="stop after this stage (default: load)")
+    common.add_argument('--profile', action='store_true',
+                        help="print time per stage, files/s and MB/s to stderr")
+
+    sas = commands.add_parser('sas', parents=[common], help="load SAS scripts and their extracted details")
+    sas.add_argument('folder', nargs='?', help="folder of SAS scripts (default: file_parser.folder_path)")
+    sas.add_argument('--sink', choices=('snowflake', 'sqlite'), default='snowflake')
+    sas.add_argument('--sqlite-path', default='scripts.db', help="database for --sink sqlite")
+    sas.add_argument('--batch-size', type=int, default=500, help="scripts per insert batch (sqlite sink)")
+    sas.add_argument('--full', action='store_true', help="append every script instead of syncing changes")
+    sas.add_argument('--manifest', default='file_parser_manifest.db', help="manifest for incremental syncs")
+
+    html = commands.add_parser('html', parents=[common], help="export rules from HTML rule reports")
+    html.add_argument('folder', help="folder of .html reports")
+    html.add_argument('--engine', choices=('lxml', 'soup'), default='lxml')
+    html.add_argument('--output', default='output_rules.xlsx',
+                      help=".xlsx, .csv, .parquet or a database URL (default: output_rules.xlsx)")
+    html.add_argument('--format', choices=('xlsx', 'csv', 'parquet', 'database'),
+                      help="output format when it cannot be told from --output")
+    html.add_argument('--cache', default='html_rules_cache.db', help="parsed report cache")
+    html.add_argument('--no-cache', action='store_true', help="parse every report, into a temporary cache")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Profiles start after the heavy imports, so they only time the ingestion itself
+    profile = run_sas(args) if args.command == 'sas' else run_html(args)
+    if args.profile:
+        profile.report()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+import csv
+import gzip
+import os
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet chunks are optional; gzip CSV needs only the standard library
+    pa = pq = None
+
+SCRIPT_COLUMNS = ("script_name", "code")
+
+
+def batched_scripts(scripts, batch_size, max_batch_bytes):
+    """Group scripts into lists, ending a list once it holds batch_size scripts or max_batch_bytes of code."""
+    batch = []
+    batch_bytes = 0
+    for script in scripts:
+        batch.append(script)
+        batch_bytes += len(script[1])
+        if len(batch) >= batch_size or batch_bytes >= max_batch_bytes:
+            yield batch
+            batch = []
+            batch_bytes = 0
+    if batch:
+        yield batch
+
+
+class Sink(ABC):
+    """Where scanned scripts are loaded: a script table plus one table per kind of detail row.
+
+    Scripts arrive as (script_name, code, details), where details maps a kind
+    to its rows, and detail_tables maps each kind to (table name, columns).
+    Every detail table starts with a script_name column. file_parser only
+    talks to this interface, so the warehouse can be swapped for a local
+    database in development and tests.
+    """
+
+    def __init__(self, script_table, detail_tables):
+        self.script_table = script_table
+        self.detail_tables = detail_tables
+
+    def _detail_columns(self, kind):
+        return ("script_name",) + tuple(self.detail_tables[kind][1])
+
+    @abstractmethod
+    def create_tables(self):
+        """Create the script and detail tables if they do not exist."""
+
+    @abstractmethod
+    def append(self, scripts):
+        """Load every script and its details; return (script count, {kind: detail row count})."""
+
+    @abstractmethod
+    def sync(self, scripts, deleted):
+        """Upsert changed scripts and remove deleted ones in one transaction.
+
+        The details of every changed or deleted script are replaced.
+        deleted() returns the removed script names; it is only called once
+        scripts is exhausted. Returns (changed count, deleted count, {kind: detail row count}).
+        """
+
+    def close(self):
+        pass
+
+
+class SqliteSink(Sink):
+    """Load into a local SQLite database with batched executemany, for development and tests."""
+
+    def __init__(self, connection, script_table, detail_tables, batch_size=500, max_batch_bytes=64 * 1024 * 1024):
+        super().__init__(script_table, detail_tables)
+        self.connection = connection
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+
+    def _tables(self):
+        yield self.script_table, SCRIPT_COLUMNS
+        for kind, (table, _) in self.detail_tables.items():
+            yield table, self._detail_columns(kind)
+
+    def create_tables(self):
+        with self.connection:
+            for table, columns in self._tables():
+                self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_script_name ON {table} (script_name)")
+
+    def _insert(self, batch, counts):
+        self.connection.executemany(f"INSERT INTO {self.script_table} (script_name, code) VALUES (?, ?)",
+                                    [(name, code) for name, code, _ in batch])
+        for kind, (table, _) in self.detail_tables.items():
+            rows = [(name, *row) for name, _, details in batch for row in details[kind]]
+            columns = self._detail_columns(kind)
+            self.connection.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows
+            )
+            counts[kind] = counts.get(kind, 0) + len(rows)
+
+    def _delete(self, names):
+        for table, _ in self._tables():
+            self.connection.executemany(f"DELETE FROM {table} WHERE script_name = ?", [(name,) for name in names])
+
+    def append(self, scripts):
+        script_count = 0
+        counts = {}
+        with self.connection:
+            for batch in batched_scripts(scripts, self.batch_size, self.max_batch_bytes):
+                self._insert(batch, counts)
+                script_count += len(batch)
+        return script_count, counts
+
+    def sync(self, scripts, deleted):
+        changed_count = 0
+        counts = {}
+        with self.connection:  # One transaction: all changes apply or none do
+            for batch in batched_scripts(scripts, self.batch_size, self.max_batch_bytes):
+                self._delete([name for name, _, _ in batch])
+                self._insert(batch, counts)
+                changed_count += len(batch)
+            deleted_names = list(deleted())
+            self._delete(deleted_names)
+        return changed_count, len(deleted_names), counts
+
+    def close(self):
+        self.connection.close()
+
+
+class ChunkWriter:
+    """Write rows to numbered compressed files, starting a new file every rows_per_file rows or max_bytes of text.
+
+    on_file(path) is called as each file is completed, so it can be uploaded
+    and deleted while the next one is written.
+    """
+
+    def __init__(self, directory, name, columns, on_file, file_format="csv",
+                 rows_per_file=100000, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.name = name
+        self.columns = columns
+        self.on_file = on_file
+        self.file_format = file_format
+        self.rows_per_file = rows_per_file
+        self.max_bytes = max_bytes
+        self.prefix = uuid.uuid4().hex[:8]  # New names each run, so COPY never skips a file as already loaded
+        self.file_count = 0
+        self.row_count = 0
+        self.path = None
+        self.file = None
+        self.rows = None
+
+    def write(self, row):
+        if self.path is not None and (self.file_rows >= self.rows_per_file or self.file_bytes >= self.max_bytes):
+            self._finish_file()
+        if self.path is None:
+            self._start_file()
+        if self.file_format == "parquet":
+            self.rows.append(row)
+        else:
+            self.writer.writerow(row)
+        self.file_rows += 1
+        self.file_bytes += sum(len(value) for value in row if isinstance(value, str))
+        self.row_count += 1
+
+    def close(self):
+        if self.path is not None:
+            self._finish_file()
+
+    def _start_file(self):
+        extension = "parquet" if self.file_format == "parquet" else "csv.gz"
+        self.path = os.path.join(self.directory, f"{self.name}_{self.prefix}_{self.file_count:05d}.{extension}")
+        self.file_count += 1
+        self.file_rows = 0
+        self.file_bytes = 0
+        if self.file_format == "parquet":
+            self.rows = []
+        else:
+            self.file = gzip.open(self.path, "wt", encoding="utf-8", newline="", compresslevel=6)
+            # Strings are always quoted, so an empty string stays distinct from NULL
+            self.writer = csv.writer(self.file, quoting=csv.QUOTE_NONNUMERIC)
+
+    def _finish_file(self):
+        if self.file_format == "parquet":
+            table = pa.table({column: [row[i] for row in self.rows] for i, column in enumerate(self.columns)})
+            pq.write_table(table, self.path)
+            self.rows = None
+        else:
+            self.file.close()
+            self.file = None
+        path, self.path = self.path, None
+        self.on_file(path)
+
+
+class SnowflakeSink(Sink):
+    """Bulk-load into Snowflake through a temporary internal stage.
+
+    Rows are written to compressed chunk files (gzip CSV, or Parquet with
+    file_format='parquet' when pyarrow is installed). Each file is PUT as
+    soon as it is full and removed locally, and every table is then loaded
+    with a single COPY INTO instead of binding rows one by one.
+    """
+
+    def __init__(self, connection, script_table, detail_tables, file_format="csv",
+                 rows_per_file=100000, max_file_bytes=256 * 1024 * 1024):
+        super().__init__(script_table, detail_tables)
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unknown file format: {file_format}")
+        if file_format == "parquet" and pq is None:
+            raise ImportError("Parquet chunks need pyarrow; use file_format='csv' instead")
+        self.connection = connection
+        self.cursor = connection.cursor()
+        self.file_format = file_format
+        self.rows_per_file = rows_per_file
+        self.max_file_bytes = max_file_bytes
+        self.stage = f"{script_table}_load"
+
+    def create_tables(self):
+        self.cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.script_table} (script_name STRING, code STRING)")
+        for kind, (table, _) in self.detail_tables.items():
+            columns = ", ".join(f"{column} STRING" for column in self._detail_columns(kind))
+            self.cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+
+    def _writer(self, directory, table, columns):
+        def put(path):
+            location = path.replace(os.sep, "/")
+            self.cursor.execute(f"PUT 'file://{location}' @{self.stage}/{table}/ AUTO_COMPRESS = FALSE")
+            os.remove(path)
+
+        return ChunkWriter(directory, table, columns, put, self.file_format,
+                           self.rows_per_file, self.max_file_bytes)
+
+    def _copy_into(self, table, columns):
+        if self.file_format == "parquet":
+            file_format = "FILE_FORMAT = (TYPE = PARQUET) MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE"
+            column_list = ""
+        else:
+            file_format = "FILE_FORMAT = (TYPE = CSV FIELD_OPTIONALLY_ENCLOSED_BY = '\"' COMPRESSION = GZIP)"
+            column_list = f" ({', '.join(columns)})"
+        self.cursor.execute(f"COPY INTO {table}{column_list} FROM @{self.stage}/{table}/ {file_format} PURGE = TRUE")
+
+    def _load_scripts(self, scripts, script_table, detail_tables):
+        """Stage scripts and their details as chunk files, then COPY each table.
+
+        detail_tables maps each kind to the table it is loaded into.
+        Returns (script count, {kind: detail row count}).
+        """
+        self.cursor.execute(f"CREATE OR REPLACE TEMPORARY STAGE {self.stage}")
+        with tempfile.TemporaryDirectory() as directory:
+            script_writer = self._writer(directory, script_table, SCRIPT_COLUMNS)
+            detail_writers = {kind: self._writer(directory, table, self._detail_columns(kind))
+                              for kind, table in detail_tables.items()}
+            for name, code, details in scripts:
+                script_writer.write((name, code))
+                for kind, writer in detail_writers.items():
+                    for row in details[kind]:
+                        writer.write((name, *row))
+            script_writer.close()
+            for writer in detail_writers.values():
+                writer.close()
+
+        if script_writer.row_count:
+            self._copy_into(script_table, SCRIPT_COLUMNS)
+        for kind, writer in detail_writers.items():
+            if writer.row_count:
+                self._copy_into(detail_tables[kind], self._detail_columns(kind))
+        return script_writer.row_count, {kind: writer.row_count for kind, writer in detail_writers.items()}
+
+    def append(self, scripts):
+        detail_tables = {kind: table for kind, (table, _) in self.detail_tables.items()}
+        return self._load_scripts(scripts, self.script_table, detail_tables)
+
+    def sync(self, scripts, deleted):
+        stage_table = f"{self.script_table}_stage"
+        stage_tables = {kind: f"{table}_stage" for kind, (table, _) in self.detail_tables.items()}
+        deleted_table = f"{self.script_table}_deleted"
+        self.cursor.execute(f"CREATE OR REPLACE TEMPORARY TABLE {stage_table} LIKE {self.script_table}")
+        for kind, stage in stage_tables.items():
+            self.cursor.execute(f"CREATE OR REPLACE TEMPORARY TABLE {stage} LIKE {self.detail_tables[kind][0]}")
+        self.cursor.execute(f"CREATE OR REPLACE TEMPORARY TABLE {deleted_table} (script_name STRING)")
+
+        changed_count, counts = self._load_scripts(scripts, stage_table, stage_tables)
+        with tempfile.TemporaryDirectory() as directory:
+            deleted_writer = self._writer(directory, deleted_table, ("script_name",))
+            for name in deleted():
+                deleted_writer.write((name,))
+            deleted_writer.close()
+        deleted_count = deleted_writer.row_count
+        if not changed_count and not deleted_count:
+            return 0, 0, counts
+        if deleted_count:
+            self._copy_into(deleted_table, ("script_name",))
+
+        touched = f"SELECT script_name FROM {stage_table} UNION ALL SELECT script_name FROM {deleted_table}"
+        self.cursor.execute("BEGIN")
+        try:
+            self.cursor.execute(f"""
+                MERGE INTO {self.script_table} t
+                USING (
+                    SELECT script_name, code, FALSE AS deleted FROM {stage_table}
+                    UNION ALL
+                    SELECT script_name, NULL, TRUE FROM {deleted_table}
+                ) s ON t.script_name = s.script_name
+                WHEN MATCHED AND s.deleted THEN DELETE
+                WHEN MATCHED THEN UPDATE SET t.code = s.code
+                WHEN NOT MATCHED AND NOT s.deleted THEN INSERT (script_name, code) VALUES (s.script_name, s.code)
+            """)
+            for kind, (table, _) in self.detail_tables.items():
+                columns = ", ".join(self._detail_columns(kind))
+                self.cursor.execute(f"DELETE FROM {table} WHERE script_name IN ({touched})")
+                self.cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage_tables[kind]}")
+            self.cursor.execute("COMMIT")
+        except Exception:
+            self.cursor.execute("ROLLBACK")
+            raise
+        return changed_count, deleted_count, counts
+
+    def close(self):
+        self.cursor.close()
+        self.connection.close()
@@ -42,6 +42,17 @@ class NotificationOverlay(QWidget):
         error_label.setMaximumWidth(300)  # Limit width for readability
         self.notification_layout.addWidget(error_label)
 
+    def add_message(self, message):
+        """Add a non-error notification, such as a confirmation that a save went through."""
+        message_label = QLabel(message)
+        message_label.setStyleSheet(
+            "background-color: #eeffee; border: 1px solid green; padding: 5px; "
+            "border-radius: 5px; color: green; font-size: 12px;"
+        )
+        message_label.setWordWrap(True)
+        message_label.setMaximumWidth(300)
+        self.notification_layout.addWidget(message_label)
+
     def clear_all_errors(self):
         """Clear all notifications."""
         while self.notification_layout.count():
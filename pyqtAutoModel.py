@@ -5,17 +5,17 @@ from PyQt6.QtWidgets import (
     QComboBox, QSpinBox, QDoubleSpinBox, QCheckBox, QDateEdit, QTimeEdit, QDateTimeEdit,
     QFileDialog, QScrollArea, QHBoxLayout, QApplication
 )
-from PyQt6.QtCore import QDate, QTime, QDateTime
-from sqlalchemy.orm import Session, declarative_base
-from sqlalchemy import create_engine, inspect
+from PyQt6.QtCore import Qt, QDate, QTime, QDateTime
+from sqlalchemy.orm import declarative_base
+from sqlalchemy import insert
 import sys
 
-from models import User, UserRelatives
+from formSpec import compile_form_spec, invalidate_form_spec
+from notfications import NotificationOverlay
+from sessionManager import engine, session
+from submitQueue import SubmitQueue
 
-DATABASE_URI = 'sqlite:///your_database.db'
-engine = create_engine(DATABASE_URI, echo=True)
 Base = declarative_base()
-session = Session(bind=engine)
 
 
 class ModelFormFields(QWidget):
@@ -39,12 +39,14 @@ class ModelFormFields(QWidget):
                 widget.deleteLater()
 
         self.fields = {}
-        for column in inspect(self.model_class).c:
-            if column.name in self.included_columns:
-                editable = column.name in self.editable_fields
-                field = self.create_field(column, editable)
-                self.form_layout.addRow(QLabel(column.name.capitalize()), field)
-                self.fields[column.name] = field
+        for field_spec in self.form_spec():
+            field = self.create_field(field_spec)
+            self.form_layout.addRow(QLabel(field_spec.label), field)
+            self.fields[field_spec.name] = field
+
+    def form_spec(self):
+        """Column order, widget kinds, options and editable flags, compiled once per model and selection."""
+        return compile_form_spec(self.model_class, self.included_columns, self.editable_fields)
 
     def load_data(self, instance):
         """Load data from an instance into the form fields."""
@@ -55,7 +57,7 @@ class ModelFormFields(QWidget):
             if isinstance(field_widget, QLineEdit):
                 field_widget.setText(str(value))
             elif isinstance(field_widget, QComboBox):
-                index = field_widget.findText(str(value), Qt.MatchFixedString)
+                index = field_widget.findText(str(value), Qt.MatchFlag.MatchFixedString)
                 if index >= 0:
                     field_widget.setCurrentIndex(index)
             elif isinstance(field_widget, QSpinBox):
@@ -67,60 +69,83 @@ class ModelFormFields(QWidget):
             elif isinstance(field_widget, QDateEdit):
                 if isinstance(value, date):
                     field_widget.setDate(QDate(value.year, value.month, value.day))
+            elif isinstance(field_widget, QTimeEdit):
+                if isinstance(value, time):
+                    field_widget.setTime(QTime(value.hour, value.minute, value.second))
             elif isinstance(field_widget, QDateTimeEdit):
                 if isinstance(value, datetime.datetime):
                     field_widget.setDateTime(QDateTime(value.year, value.month, value.day, value.hour, value.minute, value.second))
 
+    def reset(self):
+        """Put every field back to its freshly built value so the widget can be reused."""
+        for field_widget in self.fields.values():
+            if isinstance(field_widget, QLineEdit):
+                field_widget.clear()
+            elif isinstance(field_widget, QComboBox):
+                field_widget.setCurrentIndex(0)
+            elif isinstance(field_widget, (QSpinBox, QDoubleSpinBox)):
+                field_widget.setValue(0)
+            elif isinstance(field_widget, QCheckBox):
+                field_widget.setChecked(False)
+            elif isinstance(field_widget, QDateEdit):
+                field_widget.setDate(QDate.currentDate())
+            elif isinstance(field_widget, QTimeEdit):
+                field_widget.setTime(QTime.currentTime())
+            elif isinstance(field_widget, QDateTimeEdit):
+                field_widget.setDateTime(QDateTime.currentDateTime())
 
-def collect_data(self):
-    """Collect data from form fields and return as a dictionary with appropriate data types."""
-    data = {}
-    for field_name, field_widget in self.fields.items():
-        if isinstance(field_widget, QLineEdit):
-            data[field_name] = field_widget.text()
-        elif isinstance(field_widget, QComboBox):
-            data[field_name] = field_widget.currentText()
-        elif isinstance(field_widget, QSpinBox) or isinstance(field_widget, QDoubleSpinBox):
-            data[field_name] = field_widget.value()
-        elif isinstance(field_widget, QCheckBox):
-            data[field_name] = field_widget.isChecked()
-        elif isinstance(field_widget, QDateEdit):
-            data[field_name] = field_widget.date().toPyDate()  # Converts QDate to Python date
-        elif isinstance(field_widget, QDateTimeEdit):
-            data[field_name] = field_widget.dateTime().toPyDateTime()  # Converts QDateTime to Python datetime
-        elif isinstance(field_widget, QTimeEdit):
-            data[field_name] = field_widget.time().toPyTime()  # Converts QTime to Python time
-        else:
-            data[field_name] = field_widget.text()  # Fallback to text for unknown widgets
+    def collect_data(self):
+        """Collect data from form fields and return as a dictionary with appropriate data types."""
+        data = {}
+        for field_name, field_widget in self.fields.items():
+            if isinstance(field_widget, QLineEdit):
+                data[field_name] = field_widget.text()
+            elif isinstance(field_widget, QComboBox):
+                data[field_name] = field_widget.currentText()
+            elif isinstance(field_widget, QSpinBox) or isinstance(field_widget, QDoubleSpinBox):
+                data[field_name] = field_widget.value()
+            elif isinstance(field_widget, QCheckBox):
+                data[field_name] = field_widget.isChecked()
+            elif isinstance(field_widget, QDateEdit):
+                data[field_name] = field_widget.date().toPyDate()  # Converts QDate to Python date
+            elif isinstance(field_widget, QTimeEdit):  # Before QDateTimeEdit, which QTimeEdit subclasses
+                data[field_name] = field_widget.time().toPyTime()  # Converts QTime to Python time
+            elif isinstance(field_widget, QDateTimeEdit):
+                data[field_name] = field_widget.dateTime().toPyDateTime()  # Converts QDateTime to Python datetime
+            else:
+                data[field_name] = field_widget.text()  # Fallback to text for unknown widgets
 
-    return data
+        return data
 
+    def create_field(self, field_spec):
+        kind, editable = field_spec.kind, field_spec.editable
 
-    def create_field(self, column, editable=True):
-        options_attr = f"{column.name}_options"
-        
-        if hasattr(self.model_class, options_attr):
+        if kind == 'options':
             field = QComboBox()
-            field.addItems(getattr(self.model_class, options_attr))
+            field.addItems(field_spec.options)
             field.setEnabled(editable)
-        elif column.type.python_type == int:
+        elif kind == 'int':
             field = QSpinBox()
             field.setRange(-999999999, 999999999)
             field.setReadOnly(not editable)
-        elif column.type.python_type == float:
+        elif kind == 'float':
             field = QDoubleSpinBox()
             field.setRange(-999999999.0, 999999999.0)
             field.setDecimals(6)
             field.setReadOnly(not editable)
-        elif column.type.python_type == bool:
+        elif kind == 'bool':
             field = QCheckBox()
             field.setEnabled(editable)
-        elif column.type.python_type == QDate:
+        elif kind == 'date':
             field = QDateEdit()
             field.setCalendarPopup(True)
             field.setDate(QDate.currentDate())
             field.setEnabled(editable)
-        elif column.type.python_type == QDateTime:
+        elif kind == 'time':
+            field = QTimeEdit()
+            field.setTime(QTime.currentTime())
+            field.setEnabled(editable)
+        elif kind == 'datetime':
             field = QDateTimeEdit()
             field.setCalendarPopup(True)
             field.setDateTime(QDateTime.currentDateTime())
@@ -133,21 +158,32 @@ def collect_data(self):
 
     def update_included_columns(self, included_columns):
         """Update which columns are included and rebuild the fields."""
+        invalidate_form_spec(self.model_class)
         self.included_columns = included_columns
         self.build_fields()
 
     def update_editable_fields(self, editable_fields):
         """Update which fields are editable and rebuild the fields."""
+        invalidate_form_spec(self.model_class)
         self.editable_fields = editable_fields
         self.build_fields()
 
 
 class ModelForm(QWidget):
-    def __init__(self, form_fields, *args, **kwargs):
+    def __init__(self, form_fields, bulk_submit=False, async_submit=False, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
         self.form_fields = form_fields
+        self.bulk_submit = bulk_submit  # One multi-row INSERT per table instead of one ORM object per section
+        # Commit on a background writer thread; results and errors come back as signals
+        self.submit_queue = None
+        if async_submit:
+            self.submit_queue = SubmitQueue(engine, parent=self)
+            self.submit_queue.succeeded.connect(self._on_submit_succeeded)
+            self.submit_queue.failed.connect(self._on_submit_failed)
+            self.submit_queue.retrying.connect(self._on_submit_retrying)
         self.forms_container = {}
+        self.widget_pool = {}  # title -> removed section widgets kept for reuse
 
         self.main_layout = QVBoxLayout(self)
 
@@ -159,6 +195,10 @@ class ModelForm(QWidget):
         self.submit_button.clicked.connect(self.submit_form)
         self.main_layout.addWidget(self.submit_button)
 
+        self.notification_overlay = NotificationOverlay(self)
+        self.notification_overlay.setGeometry(50, 50, 400, 200)
+        self.notification_overlay.hide()
+
     def add_form_section(self, field_info):
         form_fields = field_info['form']
         title = field_info['title']
@@ -181,17 +221,28 @@ class ModelForm(QWidget):
         self.main_layout.addLayout(section_layout)
 
     def add_form_instance(self, form_fields, title, instance_data=None, duplicatable=False):
-        """Add a new instance of ModelFormFields to the container layout."""
+        """Add an instance of ModelFormFields to the container layout, recycling a removed one if possible."""
+        pool = self.widget_pool.setdefault(title, [])
+        if pool:
+            form_container_widget = pool.pop()
+        else:
+            form_container_widget = self._build_form_instance(form_fields, title, duplicatable)
+
+        if instance_data:
+            form_container_widget.form_instance.load_data(instance_data)
+
+        self.forms_container[title].addWidget(form_container_widget)
+        form_container_widget.show()
+
+    def _build_form_instance(self, form_fields, title, duplicatable):
         form_instance = ModelFormFields(
             model_class=form_fields.model_class,
             included_columns=form_fields.included_columns,
             editable_fields=form_fields.editable_fields
         )
 
-        if instance_data:
-            form_instance.load_data(instance_data)
-
         form_container_widget = QWidget()
+        form_container_widget.form_instance = form_instance
         form_layout = QVBoxLayout(form_container_widget)
         form_layout.addWidget(form_instance)
 
@@ -200,12 +251,19 @@ class ModelForm(QWidget):
             delete_button.clicked.connect(lambda: self.remove_form_instance(form_container_widget, title))
             form_layout.addWidget(delete_button)
 
-        self.forms_container[title].addWidget(form_container_widget)
-
+        return form_container_widget
 
     def remove_form_instance(self, form_container_widget, title):
+        """Take a section out of the layout and keep it, reset, for the next add."""
         self.forms_container[title].removeWidget(form_container_widget)
-        form_container_widget.deleteLater()
+        form_container_widget.hide()
+        form_container_widget.form_instance.reset()
+        self.widget_pool.setdefault(title, []).append(form_container_widget)
+
+    def _section_widgets(self, title):
+        form_container = self.forms_container[title]
+        widgets = (form_container.itemAt(i).widget() for i in range(form_container.count()))
+        return [widget for widget in widgets if widget is not None]
 
     def load_data(self, instances_data):
         """
@@ -220,54 +278,83 @@ class ModelForm(QWidget):
             if not form_container:
                 continue
 
-            # Clear existing forms in the section
-            for i in reversed(range(form_container.count())):
-                widget = form_container.itemAt(i).widget()
-                if widget:
-                    widget.deleteLater()
-
             # Handle single instance (non-duplicatable) and multiple instances (duplicatable)
-            for instance_data in (instance_data_list if isinstance(instance_data_list, list) else [instance_data_list]):
-                form_fields = next(f['form'] for f in self.form_fields if f['title'] == title)
-                duplicatable = next(f['duplicatable'] for f in self.form_fields if f['title'] == title)
+            instances = instance_data_list if isinstance(instance_data_list, list) else [instance_data_list]
+            existing = self._section_widgets(title)
+
+            # Refill the sections already shown, then add or pool the difference
+            for form_container_widget, instance_data in zip(existing, instances):
+                form_container_widget.form_instance.reset()
+                form_container_widget.form_instance.load_data(instance_data)
+            for form_container_widget in existing[len(instances):]:
+                self.remove_form_instance(form_container_widget, title)
+
+            form_fields = next(f['form'] for f in self.form_fields if f['title'] == title)
+            duplicatable = next(f['duplicatable'] for f in self.form_fields if f['title'] == title)
+            for instance_data in instances[len(existing):]:
                 self.add_form_instance(form_fields, title, instance_data=instance_data, duplicatable=duplicatable)
 
+    def collect_form_data(self):
+        """Return (data per section title, row dicts grouped by model class) for every section."""
+        all_data = {}
+        rows_by_model = {}
 
-            
-    def submit_form(self):
-        try:
-            all_data = {}
-    
-            for field_info in self.form_fields:
-                title = field_info['title']
-                duplicatable = field_info.get('duplicatable', False)
-                form_container = self.forms_container[title]
-                model_class = field_info['form'].model_class
-    
-                if duplicatable:
-                    data_list = []
-                    for i in range(form_container.count()):
-                        form_instance_widget = form_container.itemAt(i).widget()
-                        form_instance = form_instance_widget.findChild(ModelFormFields)
-                        if form_instance:
-                            data = form_instance.collect_data()
-                            data_list.append(data)
-                            # Create an instance of the model class with the collected data and add to session
-                            instance = model_class(**data)
-                            session.add(instance)
-                    all_data[title] = data_list
-                else:
-                    form_instance = form_container.itemAt(0).widget().findChild(ModelFormFields)
+        for field_info in self.form_fields:
+            title = field_info['title']
+            duplicatable = field_info.get('duplicatable', False)
+            form_container = self.forms_container[title]
+            model_class = field_info['form'].model_class
+            rows = rows_by_model.setdefault(model_class, [])
+
+            if duplicatable:
+                data_list = []
+                for i in range(form_container.count()):
+                    form_instance_widget = form_container.itemAt(i).widget()
+                    form_instance = form_instance_widget.findChild(ModelFormFields)
                     if form_instance:
                         data = form_instance.collect_data()
-                        all_data[title] = data
-                        # Create or update the instance of the model class with the collected data
-                        instance = model_class(**data)
-                        session.add(instance)
-    
+                        data_list.append(data)
+                        rows.append(data)
+                all_data[title] = data_list
+            else:
+                form_instance = form_container.itemAt(0).widget().findChild(ModelFormFields)
+                if form_instance:
+                    data = form_instance.collect_data()
+                    all_data[title] = data
+                    rows.append(data)
+
+        return all_data, rows_by_model
+
+    def write_rows(self, session, rows_by_model):
+        """Stage collected rows in session; the caller commits."""
+        for model_class, rows in rows_by_model.items():
+            if not rows:
+                continue
+            if self.bulk_submit:
+                # Executemany in a single round trip for the whole table
+                session.execute(insert(model_class), rows)
+            else:
+                # Create an instance of the model class with the collected data and add to session
+                session.add_all([model_class(**data) for data in rows])
+
+    def submit_form(self):
+        if self.submit_queue is not None:
+            all_data, rows_by_model = self.collect_form_data()
             print("Collected form data:", all_data)
-    
-            # Commit all new instances to the database
+            # No second submit until the worker reports back, so a double click cannot insert twice
+            self.submit_button.setEnabled(False)
+            self.notification_overlay.clear_all_errors()
+            self.notification_overlay.hide()
+            self.submit_queue.submit(lambda worker_session: self.write_rows(worker_session, rows_by_model),
+                                     tag=self)
+            return
+
+        try:
+            all_data, rows_by_model = self.collect_form_data()
+            print("Collected form data:", all_data)
+            self.write_rows(session, rows_by_model)
+
+            # Commit all new rows to the database in one transaction
             session.commit()
             print("Data saved successfully!")
     
@@ -277,6 +364,21 @@ class ModelForm(QWidget):
         finally:
             session.close()
 
+    def _on_submit_succeeded(self, tag, result):
+        print("Data saved successfully!")
+        self.submit_button.setEnabled(True)
+        self.notification_overlay.add_message("Data saved successfully.")
+        self.notification_overlay.show()
+
+    def _on_submit_failed(self, tag, message):
+        print("An error occurred:", message)
+        self.submit_button.setEnabled(True)
+        self.notification_overlay.add_error(f"Could not save: {message}")
+        self.notification_overlay.show()
+
+    def _on_submit_retrying(self, tag, attempt, delay):
+        print(f"Database is locked, retrying in {delay:.2f}s (attempt {attempt})")
+
 
     def update_form_fields(self, title, included_columns=None, editable_fields=None):
         form_container = self.forms_container.get(title)
@@ -288,34 +390,35 @@ class ModelForm(QWidget):
                 if editable_fields is not None:
                     form_fields.update_editable_fields(editable_fields)
 
-                # Remove and re-add the form to refresh the UI
-                for i in reversed(range(form_container.count())):
-                    widget = form_container.itemAt(i).widget()
-                    if widget:
-                        widget.deleteLater()
+                # The fields changed, so neither shown nor pooled sections can be reused
+                for widget in self._section_widgets(title) + self.widget_pool.pop(title, []):
+                    form_container.removeWidget(widget)
+                    widget.deleteLater()
 
                 # Re-add updated form instance with correct duplicatable setting
                 duplicatable = next((f['duplicatable'] for f in self.form_fields if f['title'] == title), False)
                 self.add_form_instance(form_fields, title, duplicatable=duplicatable)
 
 
+if __name__ == "__main__":
+    from models import User, UserRelatives
 
-# Initialize QApplication
-app = QApplication(sys.argv)
+    # Initialize QApplication
+    app = QApplication(sys.argv)
 
-# Initialize form fields
-user_form_fields = ModelFormFields(User, included_columns=['name', 'email'], editable_fields=['name'])
-relative_form_fields = ModelFormFields(UserRelatives, included_columns=['relation', 'name'], editable_fields=['name', 'relation'])
+    # Initialize form fields
+    user_form_fields = ModelFormFields(User, included_columns=['name', 'email'], editable_fields=['name'])
+    relative_form_fields = ModelFormFields(UserRelatives, included_columns=['relation', 'name'], editable_fields=['name', 'relation'])
 
-# Create ModelForm with multiple fields
-form = ModelForm([
-    {'form': user_form_fields, 'title': 'User', 'duplicatable': False},
-    {'form': relative_form_fields, 'title': 'Relatives', 'duplicatable': True}
-])
+    # Create ModelForm with multiple fields
+    form = ModelForm([
+        {'form': user_form_fields, 'title': 'User', 'duplicatable': False},
+        {'form': relative_form_fields, 'title': 'Relatives', 'duplicatable': True}
+    ], bulk_submit=True, async_submit=True)
 
-form.update_form_fields('User',included_columns=['name','email'],editable_fields=[])
-# Show the form
-form.show()
+    form.update_form_fields('User',included_columns=['name','email'],editable_fields=[])
+    # Show the form
+    form.show()
 
-# Execute the application
-sys.exit(app.exec())
+    # Execute the application
+    sys.exit(app.exec())
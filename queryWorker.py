@@ -0,0 +1,57 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+
+class QueryWorkerSignals(QObject):
+    finished = pyqtSignal(int, object)  # generation, result
+    failed = pyqtSignal(int, str)  # generation, error message
+
+
+class QueryWorker(QRunnable):
+    """Run a query on a thread pool thread with its own session.
+
+    fetch is called as fetch(session) and must return plain data (column
+    tuples or detached objects). Results are delivered through signals
+    tagged with the generation the worker was started for, so the receiver
+    can drop anything that is no longer current.
+    """
+
+    def __init__(self, engine, generation, fetch):
+        super().__init__()
+        self.engine = engine
+        self.generation = generation
+        self.fetch = fetch
+        self.signals = QueryWorkerSignals()
+        self.cancelled = False
+        self._dbapi_connection = None
+
+    def cancel(self):
+        """Stop a superseded query, interrupting it mid-statement where the driver allows."""
+        self.cancelled = True
+        connection = self._dbapi_connection
+        if connection is not None and hasattr(connection, 'interrupt'):
+            connection.interrupt()  # sqlite3: makes the running statement raise
+
+    def run(self):
+        if self.cancelled:
+            return
+
+        session = Session(bind=self.engine)
+        try:
+            self._dbapi_connection = session.connection().connection.driver_connection
+            result = self.fetch(session)
+            session.expunge_all()  # results outlive the session on the GUI thread
+        except OperationalError as e:
+            if not self.cancelled:
+                self.signals.failed.emit(self.generation, str(e))
+            return
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        finally:
+            self._dbapi_connection = None
+            session.close()
+
+        if not self.cancelled:
+            self.signals.finished.emit(self.generation, result)
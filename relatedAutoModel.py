@@ -3,8 +3,8 @@ from PyQt6.QtWidgets import (
     QDateEdit, QTimeEdit, QDateTimeEdit, QLineEdit
 )
 from PyQt6.QtCore import QDate, QTime, QDateTime
-from sqlalchemy import inspect
-from datetime import datetime, date, time
+
+from formSpec import compile_form_spec
 
 class RelatedModelForm(QWidget):
     def __init__(self, related_model_class, *args, **kwargs):
@@ -17,35 +17,35 @@ class RelatedModelForm(QWidget):
 
     def build_form(self):
         """Dynamically build form fields based on related model columns."""
-        # Generate form fields based on columns in related model class
-        for column in inspect(self.related_model_class).c:
-            label = QLabel(column.name.capitalize() + ":")
-            field = self.create_field(column)
+        # Generate form fields from the cached spec of the related model's columns
+        for field_spec in compile_form_spec(self.related_model_class):
+            label = QLabel(field_spec.label + ":")
+            field = self.create_field(field_spec)
             self.form_layout.addRow(label, field)
-            self.fields[column.name] = field
+            self.fields[field_spec.name] = field
 
-    def create_field(self, column):
-        """Create an appropriate field based on column type."""
-        options_attr = f"{column.name}_options"
-        if hasattr(self.related_model_class, options_attr):
+    def create_field(self, field_spec):
+        """Create an appropriate field based on the column's widget kind."""
+        kind = field_spec.kind
+        if kind == 'options':
             field = QComboBox()
-            field.addItems(getattr(self.related_model_class, options_attr))
-        elif column.type.python_type == int:
+            field.addItems(field_spec.options)
+        elif kind == 'int':
             field = QSpinBox()
             field.setRange(-999999999, 999999999)
-        elif column.type.python_type == float:
+        elif kind == 'float':
             field = QDoubleSpinBox()
             field.setRange(-999999999.99, 999999999.99)
-        elif column.type.python_type == bool:
+        elif kind == 'bool':
             field = QCheckBox()
-        elif column.type.python_type == date:
+        elif kind == 'date':
             field = QDateEdit()
             field.setDate(QDate.currentDate())
             field.setCalendarPopup(True)
-        elif column.type.python_type == time:
+        elif kind == 'time':
             field = QTimeEdit()
             field.setTime(QTime.currentTime())
-        elif column.type.python_type == datetime:
+        elif kind == 'datetime':
             field = QDateTimeEdit()
             field.setDateTime(QDateTime.currentDateTime())
             field.setCalendarPopup(True)
@@ -0,0 +1,234 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    from sqlalchemy import Column, MetaData, Table, Text, create_engine, event
+except ImportError:
+    create_engine = None
+
+
+class RuleWriter(ABC):
+    """Destination for the wide rule table, written a batch of rows at a time.
+
+    open(columns) is called once with the column names, then write_rows()
+    for each batch of rows (lists of values, None when missing), then close().
+    If anything fails on the way, abort() is called instead of close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @abstractmethod
+    def open(self, columns):
+        """Start the output with a header of columns."""
+
+    @abstractmethod
+    def write_rows(self, rows):
+        """Append a batch of rows."""
+
+    @abstractmethod
+    def close(self):
+        """Finish the output."""
+
+    def abort(self):
+        """Release whatever open() acquired and leave no partial output behind."""
+
+
+class FileRuleWriter(RuleWriter):
+    """Writes to path + '.partial', which only replaces path once close() has finished it."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.partial_path = f"{path}.partial"
+
+    @abstractmethod
+    def finish(self):
+        """Complete and close the partial file."""
+
+    def discard(self):
+        """Close the partial file without completing it."""
+
+    def close(self):
+        self.finish()
+        os.replace(self.partial_path, self.path)
+
+    def abort(self):
+        try:
+            self.discard()
+        finally:
+            if os.path.exists(self.partial_path):
+                os.remove(self.partial_path)
+
+
+class XlsxWriter(FileRuleWriter):
+    """openpyxl write-only workbook: rows are streamed to disk instead of kept as cells."""
+
+    sheet = None
+
+    def __init__(self, path):
+        if Workbook is None:
+            raise ImportError("xlsx output needs openpyxl")
+        super().__init__(path)
+
+    def open(self, columns):
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('Sheet1')
+        self.sheet.append(list(columns))
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.sheet.append(row)
+
+    def finish(self):
+        self.workbook.save(self.partial_path)
+
+    def discard(self):
+        if self.sheet is not None:
+            self.sheet.close()  # End the sheet's row stream; openpyxl deletes its temp file at exit
+
+
+class CsvWriter(FileRuleWriter):
+    file = None
+
+    def open(self, columns):
+        self.file = open(self.partial_path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def finish(self):
+        self.file.close()
+
+    def discard(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class ParquetWriter(FileRuleWriter):
+    """One row group per batch; every column is a nullable string."""
+
+    writer = None
+
+    def __init__(self, path):
+        if pq is None:
+            raise ImportError("Parquet output needs pyarrow")
+        super().__init__(path)
+
+    def open(self, columns):
+        self.schema = pa.schema([(column, pa.string()) for column in columns])
+        self.writer = pq.ParquetWriter(self.partial_path, self.schema)
+
+    def write_rows(self, rows):
+        if rows:
+            arrays = [pa.array(values, pa.string()) for values in zip(*rows)]
+            self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def finish(self):
+        self.writer.close()
+
+    def discard(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def sql_column_names(columns, max_length=None):
+    """Return column names every database accepts for a CREATE TABLE.
+
+    Whitespace runs become one space, unprintable characters are dropped,
+    names are cut to max_length, and names that repeat one before them,
+    ignoring case, are numbered: 'Owner', 'owner' -> 'Owner', 'owner_2'.
+    """
+    names = []
+    taken = set()
+    for column in columns:
+        printable = ''.join(char for char in str(column) if char.isprintable() or char.isspace())
+        name = ' '.join(printable.split()) or 'column'
+        name = name[:max_length]
+        candidate = name
+        number = 1
+        while candidate.lower() in taken:
+            number += 1
+            suffix = f"_{number}"
+            candidate = name[:max_length - len(suffix) if max_length else None] + suffix
+        taken.add(candidate.lower())
+        names.append(candidate)
+    return names
+
+
+def _sqlite_manual_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+class DatabaseWriter(RuleWriter):
+    """Replace table_name in the database at a SQLAlchemy URL, inserting each batch with executemany.
+
+    Column names go through sql_column_names first, so keys that differ only
+    in case or exceed the database's identifier length still get a column.
+    The table is only replaced if the whole export succeeds.
+    """
+
+    engine = connection = transaction = None
+
+    def __init__(self, url, table_name='rules'):
+        if create_engine is None:
+            raise ImportError("Database output needs SQLAlchemy")
+        super().__init__(url)
+        self.table_name = table_name
+
+    def open(self, columns):
+        self.engine = create_engine(self.path)
+        if self.engine.dialect.name == 'sqlite':
+            # pysqlite commits before DDL by itself; BEGIN explicitly so the DROP and CREATE can roll back too
+            event.listen(self.engine, 'connect', _sqlite_manual_transactions)
+            event.listen(self.engine, 'begin', lambda connection: connection.exec_driver_sql('BEGIN'))
+        self.columns = sql_column_names(columns, self.engine.dialect.max_identifier_length)
+        self.table = Table(self.table_name, MetaData(), *(Column(column, Text) for column in self.columns))
+        self.connection = self.engine.connect()
+        self.transaction = self.connection.begin()
+        self.table.drop(self.connection, checkfirst=True)
+        self.table.create(self.connection)
+
+    def write_rows(self, rows):
+        if rows:
+            self.connection.execute(self.table.insert(), [dict(zip(self.columns, row)) for row in rows])
+
+    def close(self):
+        self.transaction.commit()
+        self._release()
+
+    def abort(self):
+        try:
+            if self.transaction is not None and self.transaction.is_active:
+                self.transaction.rollback()
+        finally:
+            self._release()
+
+    def _release(self):
+        if self.connection is not None:
+            self.connection.close()
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+WRITERS = {'xlsx': XlsxWriter, 'csv': CsvWriter, 'parquet': ParquetWriter, 'database': DatabaseWriter}
+
+
+def output_format(path):
+    """Guess the format from a file extension, or 'database' for a URL like sqlite:///rules.db."""
+    if '://' in path:
+        return 'database'
+    return path.rsplit('.', 1)[-1].lower()
@@ -0,0 +1,49 @@
+import re
+
+# One pass over a script finds every statement we care about. Comments are an
+# alternative of their own so that anything inside them is consumed, not matched;
+# a * comment statement starts a line or follows the ; of the statement before it.
+SAS_PATTERN = re.compile(r"""
+      (?P<comment>/\*.*?\*/|(?:^|(?<=;))[ \t]*%?\*[^;]*;)
+    | %let\s+(?P<macro>\w+)\s*=\s*(?P<macro_value>[^;]*);
+    | \blibname\s+(?P<libref>\w+)\s+(?P<lib_path>[^;]*);
+    | %include\s+(?P<include>[^;]*);
+    | (?:^|(?<=;))\s*(?P<step>data|proc)\s+(?P<step_name>[\w.&]+)
+""", re.IGNORECASE | re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+# Handles both ll_name and ll_name01, ll_name02, etc.
+LUL_MACRO = re.compile(r"ll_name\d*", re.IGNORECASE)
+WORD = re.compile(r"\w+")
+
+# Detail rows found per script, by kind; each table also has a leading script_name column
+DETAIL_COLUMNS = {
+    "lul_names": ("lul_name",),
+    "macros": ("macro_name", "macro_value"),
+    "libnames": ("libref", "path"),
+    "steps": ("step_order", "step_type", "step_name"),
+    "includes": ("target",),
+}
+
+
+def extract(code):
+    """Return {kind: [row, ...]} for every kind in DETAIL_COLUMNS, from a single scan of code."""
+    details = {kind: [] for kind in DETAIL_COLUMNS}
+    macros = details["macros"]
+    libnames = details["libnames"]
+    steps = details["steps"]
+    includes = details["includes"]
+
+    for match in SAS_PATTERN.finditer(code):
+        kind = match.lastgroup
+        if kind == "macro_value":
+            macros.append((match["macro"], match["macro_value"].strip()))
+        elif kind == "lib_path":
+            libnames.append((match["libref"], match["lib_path"].strip().strip("'\"")))
+        elif kind == "step_name":
+            steps.append((len(steps), match["step"].lower(), match["step_name"]))
+        elif kind == "include":
+            includes.append((match["include"].strip().strip("'\""),))
+
+    details["lul_names"] = [(value,) for name, value in macros
+                            if LUL_MACRO.fullmatch(name) and WORD.fullmatch(value)]
+    return details
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+
+def is_text_column(column):
+    """True for columns whose values are Python strings."""
+    try:
+        return column.type.python_type is str
+    except NotImplementedError:
+        return False
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class RowSearchIndex:
+    """In-memory substring index over the text columns of already loaded rows.
+
+    Every text value is lowercased once and split into trigrams, so a filter
+    only has to verify the rows whose posting lists contain all trigrams of
+    the search text. Matches are case-insensitive substring matches on any
+    single column, the same as the ilike OR filter done by the database.
+    """
+
+    def __init__(self, text_values, cache_size=64):
+        self.text_values = text_values  # row -> iterable of the row's text column values
+        self.cache_size = cache_size
+        self.clear()
+
+    def clear(self):
+        self.rows = []
+        self.texts = []  # per row: tuple of lowercased column values
+        self.postings = {}  # trigram -> set of row ids
+        self.cache = OrderedDict()  # search text -> list of row ids
+        self.is_built = False
+
+    def build(self, rows):
+        """Index rows from scratch."""
+        self.clear()
+        for row in rows:
+            self._index(row)
+        self.is_built = True
+
+    def add(self, row):
+        """Index one more row, e.g. after a form submit, without rebuilding."""
+        row_id = self._index(row)
+        # Cached results stay valid if the new row is appended where it matches
+        for text, row_ids in self.cache.items():
+            if self._row_matches(row_id, text):
+                row_ids.append(row_id)
+
+    def remove(self, predicate):
+        """Drop the rows for which predicate(row) is true; their ids are never reused."""
+        removed = set()
+        for row_id, row in enumerate(self.rows):
+            if row is not None and predicate(row):
+                self.rows[row_id] = None
+                self.texts[row_id] = ()  # Can no longer match any search
+                removed.add(row_id)
+        if removed:
+            for text, row_ids in self.cache.items():
+                row_ids[:] = [row_id for row_id in row_ids if row_id not in removed]
+
+    def _index(self, row):
+        row_id = len(self.rows)
+        values = tuple(str(value).lower() for value in self.text_values(row) if value is not None)
+        self.rows.append(row)
+        self.texts.append(values)
+        for value in values:
+            for gram in _trigrams(value):
+                self.postings.setdefault(gram, set()).add(row_id)
+        return row_id
+
+    def _row_matches(self, row_id, text):
+        return any(text in value for value in self.texts[row_id])
+
+    def search(self, text):
+        """Return the indexed rows containing text, in load order."""
+        text = text.lower()
+        if not text:
+            return [row for row in self.rows if row is not None]
+
+        row_ids = self.cache.get(text)
+        if row_ids is not None:
+            self.cache.move_to_end(text)
+            return [self.rows[row_id] for row_id in row_ids]
+
+        row_ids = self._search_ids(text)
+        self.cache[text] = row_ids
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return [self.rows[row_id] for row_id in row_ids]
+
+    def _search_ids(self, text):
+        # Narrow down from the best previous result we can refine, e.g. "jo" -> "joh"
+        candidates = None
+        for cached_text, cached_ids in self.cache.items():
+            if cached_text in text and (candidates is None or len(cached_ids) < len(candidates)):
+                candidates = cached_ids
+
+        grams = _trigrams(text)
+        if grams:
+            postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+            gram_ids = set.intersection(*postings)
+            if candidates is None or len(gram_ids) < len(candidates):
+                candidates = sorted(gram_ids)
+
+        if candidates is None:
+            candidates = range(len(self.rows))
+        return [row_id for row_id in candidates if self._row_matches(row_id, text)]
@@ -0,0 +1,64 @@
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+DATABASE_URI = os.environ.get('DATABASE_URI', 'sqlite:///your_database.db')
+SQL_ECHO = os.environ.get('SQL_ECHO') == '1'  # Log every statement; debugging only, it is synchronous
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run while a form commits; NORMAL sync is safe under WAL and much faster."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def create_db_engine(uri=DATABASE_URI, echo=SQL_ECHO, pool_size=5, max_overflow=10):
+    """Create a pooled engine shared by the GUI thread and the worker threads."""
+    url = make_url(uri)
+    # Compiled SQL is cached per statement shape so repeated table/form queries skip compilation
+    options = {'echo': echo, 'query_cache_size': 1200}
+
+    if url.get_backend_name() == 'sqlite':
+        connect_args = {
+            'check_same_thread': False,  # Pooled connections move between threads
+            'timeout': 30,  # Wait for a writer instead of failing at once with 'database is locked'
+            'cached_statements': 256,  # sqlite3's per-connection prepared statement cache
+        }
+        if url.database in (None, '', ':memory:'):
+            # Every connection to :memory: is a new database, so share a single one
+            engine = create_engine(uri, connect_args=connect_args, poolclass=StaticPool, **options)
+        else:
+            engine = create_engine(uri, connect_args=connect_args, pool_size=pool_size,
+                                   max_overflow=max_overflow, **options)
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
+        return engine
+
+    return create_engine(uri, pool_size=pool_size, max_overflow=max_overflow,
+                         pool_pre_ping=True, pool_recycle=1800, **options)
+
+
+engine = create_db_engine()
+SessionFactory = sessionmaker(bind=engine)
+
+# Thread-local session: each thread that touches `session` gets its own
+session = scoped_session(SessionFactory)
+
+
+@contextmanager
+def session_scope(**kwargs):
+    """A fresh session for one unit of work: commit on success, roll back on error, always close."""
+    new_session = SessionFactory(**kwargs)
+    try:
+        yield new_session
+        new_session.commit()
+    except Exception:
+        new_session.rollback()
+        raise
+    finally:
+        new_session.close()
@@ -0,0 +1,104 @@
+import random
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+
+def is_locked_error(error):
+    """True for SQLite's transient 'database is locked' / 'busy' errors."""
+    message = str(error).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+class SubmitWorkerSignals(QObject):
+    succeeded = pyqtSignal(object, object)  # tag, result of write
+    failed = pyqtSignal(object, str)  # tag, error message
+    retrying = pyqtSignal(object, int, float)  # tag, attempt, delay in seconds
+
+
+class SubmitWorker(QRunnable):
+    """Run write(session) and commit on a pool thread, retrying lock errors with backoff."""
+
+    def __init__(self, engine, write, tag, max_retries, retry_delay):
+        super().__init__()
+        self.engine = engine
+        self.write = write
+        self.tag = tag
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.signals = SubmitWorkerSignals()
+
+    def run(self):
+        attempt = 0
+        while True:
+            # expire_on_commit=False keeps returned objects readable after the session closes
+            session = Session(bind=self.engine, expire_on_commit=False)
+            try:
+                result = self.write(session)
+                session.commit()
+                session.expunge_all()
+                self.signals.succeeded.emit(self.tag, result)
+                return
+            except OperationalError as e:
+                session.rollback()
+                if not is_locked_error(e) or attempt >= self.max_retries:
+                    self.signals.failed.emit(self.tag, str(e))
+                    return
+                delay = self.retry_delay * 2 ** attempt
+                delay += random.uniform(0, delay / 2)  # Jitter so waiting writers do not retry in lockstep
+                attempt += 1
+                self.signals.retrying.emit(self.tag, attempt, delay)
+                time.sleep(delay)
+            except Exception as e:
+                session.rollback()
+                self.signals.failed.emit(self.tag, str(e))
+                return
+            finally:
+                session.close()
+
+
+class SubmitQueue(QObject):
+    """Serial background queue for form commits.
+
+    Writes run one at a time, in submit order, on a dedicated thread with
+    their own session, so a slow or locked database never blocks the GUI.
+    Outcomes come back on the GUI thread through the signals below.
+    """
+
+    succeeded = pyqtSignal(object, object)  # tag, result of write
+    failed = pyqtSignal(object, str)  # tag, error message
+    retrying = pyqtSignal(object, int, float)  # tag, attempt, delay in seconds
+
+    def __init__(self, engine, max_retries=5, retry_delay=0.1, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.pending = 0
+
+        # One writer thread: SQLite allows a single writer anyway, and it keeps commits ordered
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
+    def submit(self, write, tag=None):
+        """Queue write(session); it should add or execute statements but not commit."""
+        worker = SubmitWorker(self.engine, write, tag, self.max_retries, self.retry_delay)
+        worker.signals.succeeded.connect(self._on_succeeded)
+        worker.signals.failed.connect(self._on_failed)
+        worker.signals.retrying.connect(self.retrying)
+        self.pending += 1
+        self.thread_pool.start(worker)
+
+    def wait(self, msecs=-1):
+        """Block until queued writes finish, e.g. before the application exits."""
+        return self.thread_pool.waitForDone(msecs)
+
+    def _on_succeeded(self, tag, result):
+        self.pending -= 1
+        self.succeeded.emit(tag, result)
+
+    def _on_failed(self, tag, message):
+        self.pending -= 1
+        self.failed.emit(tag, message)
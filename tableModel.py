@@ -0,0 +1,525 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor
+from sqlalchemy import and_, or_, func
+
+
+def _sort_key(value):
+    """Sort None first, like SQLite does, without comparing None to other types."""
+    return (value is not None, value if value is not None else 0)
+
+
+class ColumnTableModel(QAbstractTableModel):
+    """Read-only table model that stores rows as column arrays.
+
+    Values are kept as they come from the database and are only turned into
+    display strings when the view asks for a visible cell, so no per-cell
+    item objects are ever created.
+    """
+
+    def __init__(self, fields, parent=None):
+        super().__init__(parent)
+        self.fields = list(fields)
+        self.columns = [[] for _ in self.fields]
+        self.header_rows = bytearray()  # 1 marks a group header row
+        self.group_index = None  # Field index rows are grouped by, if grouped
+        self.group_values = []  # Group value of each header row, in order
+        self.sort_index = None
+        self.descending = False
+        self.header_font = QFont("Arial", 12, QFont.Weight.Bold)
+        self.header_background = QColor("#d3d3d3")
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.header_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.fields)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.fields[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        is_header = self.header_rows[row]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if is_header:
+                return self.columns[0][row] if col == 0 else None
+            return str(self.columns[col][row])
+        if is_header and role == Qt.ItemDataRole.FontRole:
+            return self.header_font
+        if is_header and role == Qt.ItemDataRole.BackgroundRole:
+            return self.header_background
+        return None
+
+    def set_rows(self, rows, group_column=None):
+        """Replace the model contents with an iterable of value tuples.
+
+        When group_column is given the rows are sorted by that field and a
+        header row is emitted in front of every group.
+        """
+        rows = list(rows)
+        self.beginResetModel()
+        self.group_values = []
+        if group_column is not None:
+            group_idx = self.fields.index(group_column)
+            self.group_index = group_idx
+            rows.sort(key=lambda r: _sort_key(r[group_idx]))
+            self.columns = [[] for _ in self.fields]
+            self.header_rows = bytearray()
+            current_group = object()
+            for row in rows:
+                if row[group_idx] != current_group:
+                    current_group = row[group_idx]
+                    self.group_values.append(current_group)
+                    self._append(True, self._header_values(len(self.group_values) - 1))
+                self._append(False, row)
+        else:
+            self.group_index = None
+            self.columns = [list(col) for col in zip(*rows)] if rows else [[] for _ in self.fields]
+            self.header_rows = bytearray(len(rows))
+        self.endResetModel()
+
+    def _header_label(self, group):
+        return f"Group: {self.group_values[group]}"
+
+    def _header_values(self, group):
+        return (self._header_label(group),) + (None,) * (len(self.fields) - 1)
+
+    def _append(self, is_header, values):
+        self.header_rows.append(1 if is_header else 0)
+        for col, value in zip(self.columns, values):
+            col.append(value)
+
+    def group_header_rows(self):
+        """Return the row numbers of group headers so the view can span them."""
+        rows = []
+        row = self.header_rows.find(1)
+        while row >= 0:
+            rows.append(row)
+            row = self.header_rows.find(1, row + 1)
+        return rows
+
+    def row_values(self, row):
+        """Return the raw values of a data row, or None for a header row."""
+        if self.header_rows[row]:
+            return None
+        return [col[row] for col in self.columns]
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort data rows by a column, keeping each group under its header."""
+        if column < 0:
+            self.sort_index = None  # The view cleared its sort indicator; keep the rows as they are
+            return
+        reverse = order == Qt.SortOrder.DescendingOrder
+        self.sort_index = column
+        self.descending = reverse
+        self.layoutAboutToBeChanged.emit()
+
+        keys = self.columns[column]
+        order_idx = []
+        segment = []
+        for row, flag in enumerate(self.header_rows):
+            if flag:
+                order_idx.extend(sorted(segment, key=lambda r: _sort_key(keys[r]), reverse=reverse))
+                segment = []
+                order_idx.append(row)
+            else:
+                segment.append(row)
+        order_idx.extend(sorted(segment, key=lambda r: _sort_key(keys[r]), reverse=reverse))
+
+        self.columns = [[col[r] for r in order_idx] for col in self.columns]
+        self.header_rows = bytearray(self.header_rows[r] for r in order_idx)
+
+        new_position = {old_row: new_row for new_row, old_row in enumerate(order_idx)}
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent, [self.index(new_position[idx.row()], idx.column()) for idx in persistent]
+        )
+        self.layoutChanged.emit()
+
+    def insert_record(self, values):
+        """Insert one data row where the current sort and grouping place it.
+
+        The position is found by binary search, so no other row is touched.
+        Returns the new row number, or None when the row is not shown.
+        """
+        lo, hi = 0, len(self.header_rows)
+        if self.group_index is not None:
+            segment = self._group_segment(values[self.group_index])
+            if segment is None:
+                return None
+            lo, hi = segment
+        row = self._insert_position(values, lo, hi)
+        self._insert_rows(row, [values], is_header=False)
+        return row
+
+    def find_record(self, key_index, key):
+        """Return the row number of the data row whose key column equals key, or None.
+
+        When the rows are sorted by the key column this is a binary search of
+        each group's rows, O(g log n) for g groups. Otherwise the key column is
+        scanned with list.index, which is O(n), though in C.
+        """
+        keys = self.columns[key_index]
+        if self.sort_index == key_index:
+            for lo, hi in self._segments():
+                row = self._search_position(key, lo, hi, after_equal=False)
+                if row < hi and keys[row] == key:
+                    return row
+            return None
+
+        start = 0
+        while True:
+            try:
+                row = keys.index(key, start)
+            except ValueError:
+                return None
+            if not self.header_rows[row]:
+                return row
+            start = row + 1
+
+    def remove_record(self, key_index, key):
+        """Remove a data row by key; returns False if the row is not loaded."""
+        row = self.find_record(key_index, key)
+        if row is None:
+            return False
+        self._remove_rows(row, 1)
+        if self.group_index is not None:
+            self._group_row_removed(self.header_rows.count(1, 0, row) - 1)
+        return True
+
+    def update_record(self, key_index, values):
+        """Replace a row, moving it if its sort or group value changed."""
+        self.remove_record(key_index, values[key_index])
+        return self.insert_record(values)
+
+    def _insert_position(self, values, lo, hi):
+        """Binary search for the slot after any equal keys in rows [lo, hi)."""
+        if self.sort_index is None:
+            return hi
+        return self._search_position(values[self.sort_index], lo, hi)
+
+    def _search_position(self, value, lo, hi, after_equal=True):
+        """Binary search rows [lo, hi) of the sort column for value's slot, after or before any equal keys."""
+        keys = self.columns[self.sort_index]
+        key = _sort_key(value)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = _sort_key(keys[mid])
+            if self.descending:
+                goes_before = key > mid_key if after_equal else key >= mid_key
+            else:
+                goes_before = key < mid_key if after_equal else key <= mid_key
+            if goes_before:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _segments(self):
+        """Yield the (first, end) rows of every run of data rows between group headers."""
+        if self.group_index is None:
+            yield 0, len(self.header_rows)
+            return
+        header_row = self.header_rows.find(1)
+        while header_row >= 0:
+            end = self._segment_end(header_row)
+            yield header_row + 1, end
+            header_row = self.header_rows.find(1, end)
+
+    def _header_row(self, group):
+        row = -1
+        for _ in range(group + 1):
+            row = self.header_rows.find(1, row + 1)
+        return row
+
+    def _segment_end(self, header_row):
+        next_header = self.header_rows.find(1, header_row + 1)
+        return len(self.header_rows) if next_header < 0 else next_header
+
+    def _find_group(self, value):
+        """Return (group number, found); when not found the number is where it belongs."""
+        lo, hi = 0, len(self.group_values)
+        key = _sort_key(value)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _sort_key(self.group_values[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, lo < len(self.group_values) and self.group_values[lo] == value
+
+    def _add_group(self, group, value):
+        row = self._header_row(group) if group < len(self.group_values) else len(self.header_rows)
+        self.group_values.insert(group, value)
+        self._insert_rows(row, [self._header_values(group)], is_header=True)
+        return row
+
+    def _group_segment(self, value):
+        """Return the (first, end) rows a new row of this group goes between, creating the group if needed."""
+        group, found = self._find_group(value)
+        header_row = self._header_row(group) if found else self._add_group(group, value)
+        return header_row + 1, self._segment_end(header_row)
+
+    def _group_row_removed(self, group):
+        header_row = self._header_row(group)
+        if self._segment_end(header_row) == header_row + 1:
+            self._remove_group(group, header_row)
+
+    def _remove_group(self, group, header_row):
+        self._remove_rows(header_row, self._segment_end(header_row) - header_row)
+        del self.group_values[group]
+
+    def _insert_rows(self, row, rows, is_header):
+        self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+        for col, values in zip(self.columns, zip(*rows)):
+            col[row:row] = values
+        self.header_rows[row:row] = bytes([1 if is_header else 0]) * len(rows)
+        self.endInsertRows()
+
+    def _remove_rows(self, row, count):
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        for col in self.columns:
+            del col[row:row + count]
+        del self.header_rows[row:row + count]
+        self.endRemoveRows()
+
+
+class PagedQueryModel(ColumnTableModel):
+    """ColumnTableModel that pulls rows from a query one page at a time.
+
+    Pages are read with LIMIT and a keyset over (sort column, primary key),
+    so every page costs an index seek no matter how deep the user scrolls and
+    rows the user never scrolls to are never loaded.
+    """
+
+    def __init__(self, fields, page_size=500, parent=None):
+        super().__init__(fields, parent)
+        self.page_size = page_size
+        self.query = None
+        self.column_exprs = []
+        self.key_column = None
+        self.last_key = None
+        self.exhausted = True
+
+    def set_query(self, query, column_exprs, key_column):
+        """Start paging over query, which must not already be ordered or limited."""
+        self.beginResetModel()
+        self.query = query.with_entities(*column_exprs, key_column)
+        self.column_exprs = list(column_exprs)
+        self.key_column = key_column
+        self.columns = [[] for _ in self.fields]
+        self.header_rows = bytearray()
+        self.last_key = None
+        self.exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def set_rows(self, rows, group_column=None):
+        """Load rows eagerly, leaving paging mode (used for grouped views)."""
+        self.query = None
+        self.exhausted = True
+        super().set_rows(rows, group_column=group_column)
+
+    def insert_record(self, values):
+        """Insert a row unless it sorts after the loaded pages, where fetchMore will read it."""
+        if self.query is not None and not self.exhausted:
+            if self._insert_position(values, 0, len(self.header_rows)) == len(self.header_rows):
+                return None
+        return super().insert_record(values)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        page = self._page_query().limit(self.page_size).all()
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if not page:
+            return
+
+        last = page[-1]
+        sort_value = last[self.sort_index] if self.sort_index is not None else None
+        self.last_key = (sort_value, last[-1])
+
+        self._insert_rows(len(self.header_rows), page, is_header=False)
+
+    def _page_query(self):
+        """Order by (sort column, key) and seek past the last row already loaded."""
+        key = self.key_column
+        sort_col = self.column_exprs[self.sort_index] if self.sort_index is not None else None
+        query = self.query
+
+        if sort_col is None:
+            if self.last_key is not None:
+                last_pk = self.last_key[1]
+                query = query.filter(key < last_pk if self.descending else key > last_pk)
+            return query.order_by(key.desc() if self.descending else key.asc())
+
+        # NULLs are pinned first ascending / last descending so the seek
+        # condition below is the same on every backend
+        if self.last_key is not None:
+            last_value, last_pk = self.last_key
+            if self.descending:
+                if last_value is None:
+                    query = query.filter(and_(sort_col.is_(None), key < last_pk))
+                else:
+                    query = query.filter(or_(
+                        sort_col < last_value,
+                        sort_col.is_(None),
+                        and_(sort_col == last_value, key < last_pk),
+                    ))
+            else:
+                if last_value is None:
+                    query = query.filter(or_(
+                        sort_col.isnot(None),
+                        and_(sort_col.is_(None), key > last_pk),
+                    ))
+                else:
+                    query = query.filter(or_(
+                        sort_col > last_value,
+                        and_(sort_col == last_value, key > last_pk),
+                    ))
+
+        if self.descending:
+            return query.order_by(sort_col.desc().nulls_last(), key.desc())
+        return query.order_by(sort_col.asc().nulls_first(), key.asc())
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Re-page from the database in the new order instead of sorting in memory."""
+        if self.query is None:
+            return super().sort(column, order)
+        self.sort_index = column if column >= 0 else None
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.set_query(self.query.with_entities(*self.column_exprs, self.key_column),
+                       self.column_exprs, self.key_column)
+
+
+def group_counts(query, group_expr):
+    """Return (group value, row count) pairs for query, ordered by group value."""
+    return (
+        query.order_by(None)
+        .with_entities(group_expr, func.count())
+        .group_by(group_expr)
+        .order_by(group_expr)
+        .all()
+    )
+
+
+def group_rows(query, column_exprs, group_expr, group_value, sort_index=None, descending=False):
+    """Return the row tuples of one group, ordered by the column at sort_index."""
+    condition = group_expr.is_(None) if group_value is None else group_expr == group_value
+    query = query.order_by(None).with_entities(*column_exprs).filter(condition)
+    if sort_index is not None:
+        sort_col = column_exprs[sort_index]
+        query = query.order_by(sort_col.desc() if descending else sort_col.asc())
+    return query.all()
+
+
+class GroupedQueryModel(ColumnTableModel):
+    """Collapsible grouped table built from one GROUP BY query.
+
+    Only the group headers and their counts are loaded up front; the rows of
+    a group are fetched through fetch_group when it is expanded and dropped
+    again when it is collapsed.
+    """
+
+    def __init__(self, fields, parent=None):
+        super().__init__(fields, parent)
+        self.group_sizes = []  # Row count of each group, parallel to group_values
+        self.expanded = []  # Whether each group's rows are loaded
+        self.fetch_group = None  # callable(group value, sort index, descending) -> row tuples
+
+    def set_groups(self, groups, fetch_group, group_index):
+        """Show collapsed headers for (group value, count) pairs."""
+        self.beginResetModel()
+        self.group_index = group_index
+        self.group_values = [value for value, _ in groups]
+        self.group_sizes = [count for _, count in groups]
+        self.expanded = [False] * len(groups)
+        self.fetch_group = fetch_group
+        self.columns = [[] for _ in self.fields]
+        self.header_rows = bytearray()
+        for group in range(len(self.group_values)):
+            self._append(True, self._header_values(group))
+        self.endResetModel()
+
+    def set_counts(self, groups):
+        """Bring headers and counts in line with fresh (group value, count) pairs, keeping expanded rows."""
+        counts = dict(groups)
+        for group in reversed(range(len(self.group_values))):
+            if self.group_values[group] not in counts:
+                self._remove_group(group, self._header_row(group))
+        for value, count in groups:
+            group, found = self._find_group(value)
+            if not found:
+                self._add_group(group, value)
+            self.group_sizes[group] = count
+            self._refresh_header(group)
+
+    def _header_label(self, group):
+        arrow = '▼' if self.expanded[group] else '▶'
+        return f"{arrow} Group: {self.group_values[group]} ({self.group_sizes[group]})"
+
+    def _refresh_header(self, group):
+        row = self._header_row(group)
+        self.columns[0][row] = self._header_label(group)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 0))
+
+    def toggle_group(self, row):
+        """Expand or collapse the group whose header is at row."""
+        if not self.header_rows[row]:
+            return
+        group = self.header_rows.count(1, 0, row)
+
+        if self.expanded[group]:
+            child_count = self._segment_end(row) - row - 1
+            if child_count:
+                self._remove_rows(row + 1, child_count)
+        else:
+            rows = self.fetch_group(self.group_values[group], self.sort_index, self.descending)
+            if rows:
+                self._insert_rows(row + 1, rows, is_header=False)
+
+        self.expanded[group] = not self.expanded[group]
+        self._refresh_header(group)
+
+    def _add_group(self, group, value):
+        # Parallel lists must hold the new group before its header label is built
+        self.group_sizes.insert(group, 0)
+        self.expanded.insert(group, False)
+        return super()._add_group(group, value)
+
+    def _remove_group(self, group, header_row):
+        super()._remove_group(group, header_row)
+        del self.group_sizes[group]
+        del self.expanded[group]
+
+    def _group_segment(self, value):
+        """Count the new row; it is only placed in the table if its group is expanded."""
+        group, found = self._find_group(value)
+        if not found:
+            self._add_group(group, value)
+        self.group_sizes[group] += 1
+        self._refresh_header(group)
+        if not self.expanded[group]:
+            return None
+        header_row = self._header_row(group)
+        return header_row + 1, self._segment_end(header_row)
+
+    def _group_row_removed(self, group):
+        self.group_sizes[group] -= 1
+        if self.group_sizes[group] <= 0:
+            self._remove_group(group, self._header_row(group))
+        else:
+            self._refresh_header(group)
@@ -0,0 +1,169 @@
+import os
+import sqlite3
+
+import pytest
+
+# Both must be set before Qt and sessionManager are imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+
+pytest.importorskip('PyQt6.QtWidgets')
+pytest.importorskip('sqlalchemy')
+from PyQt6.QtCore import Qt  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QLineEdit, QWidget  # noqa: E402
+from sqlalchemy import Column, Integer, String, text  # noqa: E402
+from sqlalchemy.orm import Session, declarative_base  # noqa: E402
+
+from autoHomeScreen import HomeScreen  # noqa: E402
+from sessionManager import engine, session  # noqa: E402
+
+
+def _has_fts5():
+    try:
+        sqlite3.connect(':memory:').execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+pytestmark = pytest.mark.skipif(not _has_fts5(), reason="SQLite is built without FTS5")
+
+Base = declarative_base()
+
+
+class Note(Base):
+    __tablename__ = 'notes'
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    body = Column(String)
+
+
+# The shorter the note and the more often it says "apple", the better its bm25 rank
+NOTES = [
+    (1, 'pie', 'apple pie with flour butter sugar cinnamon and a long list of other things'),
+    (2, 'tart', 'apple apple apple'),
+    (3, 'cider', 'pressed apple juice left to ferment for weeks'),
+    (4, 'bread', 'flour water salt'),
+    (5, 'sauce', 'apple apple sauce'),
+]
+
+
+class Screen(HomeScreen):
+    """HomeScreen with stand-ins for the option panel methods it calls but does not define."""
+
+    def create_options_panel(self):
+        self.filter_input = QLineEdit()
+        return QWidget()
+
+    def toggle_options_panel(self):
+        pass
+
+    def open_edit_form(self, row, column):
+        pass
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def notes():
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Note.__table__.insert(), [dict(id=key, title=title, body=body) for key, title, body in NOTES])
+    yield
+    session.remove()
+    with engine.begin() as conn:
+        for table in ('notes_fts', '_changelog', '_changelog_pruned'):
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+    Base.metadata.drop_all(engine)
+
+
+def rank_order(search):
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT rowid FROM notes_fts WHERE notes_fts MATCH :match ORDER BY rank"),
+                            {'match': f'"{search}"*'})
+        return [str(key) for key, in rows]
+
+
+def shown_keys(screen):
+    model = screen.table.model()
+    return [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+
+
+@pytest.mark.parametrize('use_model_view', [False, True])
+def test_full_text_results_keep_rank_order(app, notes, use_model_view):
+    screen = Screen(Note, use_model_view=use_model_view, full_text_search=True)
+    # The user sorts by a column before searching
+    screen.table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+    assert shown_keys(screen) == ['1', '2', '3', '4', '5']
+
+    expected = rank_order('apple')
+    assert expected != sorted(expected)
+
+    screen.filter_input.setText('apple')
+    screen.load_data()
+    assert shown_keys(screen) == expected
+
+    # A second load, e.g. from the change feed, must not fall back to the column sort
+    screen.load_data()
+    assert shown_keys(screen) == expected
+
+    # Clicking a header still sorts the matches by that column
+    screen.table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+    assert shown_keys(screen) == sorted(expected)
+
+
+def poll(screen):
+    """Run one change feed poll synchronously, as its worker and the GUI thread would."""
+    feed = screen.change_feed
+    visible_keys = feed.filter_snapshot()
+    with Session(bind=engine) as worker_session:
+        result = feed._fetch_changes(worker_session, visible_keys)
+        worker_session.expunge_all()
+    feed._on_fetched(0, result)
+
+
+def count_calls(monkeypatch, screen, name):
+    calls = []
+    method = getattr(screen, name)
+    monkeypatch.setattr(screen, name, lambda *args: calls.append(args) or method(*args))
+    return calls
+
+
+def test_change_batch_is_filtered_with_one_query(app, notes, monkeypatch):
+    screen = Screen(Note, use_model_view=True, poll_interval_ms=60000)
+    screen.table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+    screen.filter_input.setText('apple')
+    screen.load_data()
+    assert shown_keys(screen) == ['1', '2', '3', '5']
+
+    lookups = count_calls(monkeypatch, screen, '_visible_keys')
+    with engine.begin() as conn:
+        conn.execute(Note.__table__.insert(), [dict(id=6, title='jam', body='apple jam'),
+                                               dict(id=7, title='soup', body='leek soup')])
+        conn.execute(Note.__table__.update().where(Note.id == 2).values(body='pear tart'))
+        conn.execute(Note.__table__.delete().where(Note.id == 3))
+    poll(screen)
+
+    assert shown_keys(screen) == ['1', '5', '6']
+    assert len(lookups) == 1 and sorted(lookups[0][1]) == [2, 6, 7]
+
+
+def test_change_batch_refreshes_group_counts_once(app, notes, monkeypatch):
+    screen = Screen(Note, use_model_view=True, poll_interval_ms=60000)
+    screen.group_by_column = 'title'
+    screen.load_data()
+    assert screen.table_model is screen.group_model
+
+    refreshes = count_calls(monkeypatch, screen, '_refresh_group_counts')
+    with engine.begin() as conn:
+        conn.execute(Note.__table__.update().values(title='dessert').where(Note.id.in_([1, 2])))
+        conn.execute(Note.__table__.delete().where(Note.id == 3))
+    poll(screen)
+
+    assert len(refreshes) == 1
+    model = screen.group_model
+    assert [model.data(model.index(row, 0)) for row in model.group_header_rows()] == [
+        '▶ Group: bread (1)', '▶ Group: dessert (2)', '▶ Group: sauce (1)']
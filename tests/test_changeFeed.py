@@ -0,0 +1,118 @@
+import pytest
+
+pytest.importorskip('PyQt6.QtCore')
+pytest.importorskip('sqlalchemy')
+from sqlalchemy import Column, Integer, String, create_engine, text  # noqa: E402
+from sqlalchemy.orm import Session, declarative_base  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from changeFeed import CHANGELOG_TABLE, ChangeFeed  # noqa: E402
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = 'items'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def execute(engine, statement, **params):
+    with engine.begin() as conn:
+        conn.execute(text(statement), params)
+
+
+def fetch(feed, visible_keys=None):
+    with Session(bind=feed.engine) as session:
+        watermark, instances, removed, visible = feed._fetch_changes(session, visible_keys)
+        keys = None if instances is None else sorted(instance.id for instance in instances)
+    if visible_keys is not None:
+        return watermark, keys, sorted(removed), visible
+    return watermark, keys, sorted(removed)
+
+
+def test_changes_collapse_to_the_last_operation_per_key(engine):
+    feed = ChangeFeed(engine, Item)
+    feed.start()
+    execute(engine, "INSERT INTO items (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')")
+    execute(engine, "UPDATE items SET name = 'z' WHERE id = 1")
+    execute(engine, "DELETE FROM items WHERE id = 2")
+
+    watermark, keys, removed = fetch(feed)
+    assert (keys, removed) == ([1, 3], [2])
+    feed.watermark = watermark
+    assert fetch(feed) == (watermark, [], [])
+
+
+def test_key_change_reports_the_old_key_as_removed(engine):
+    feed = ChangeFeed(engine, Item)
+    execute(engine, "INSERT INTO items (id, name) VALUES (1, 'a')")
+    feed.start()
+    execute(engine, "UPDATE items SET id = 5 WHERE id = 1")
+
+    _, keys, removed = fetch(feed)
+    assert (keys, removed) == ([5], [1])
+
+
+def test_start_replaces_triggers_from_an_older_version(engine):
+    execute(engine, f"CREATE TABLE {CHANGELOG_TABLE} (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "table_name TEXT NOT NULL, row_key, op TEXT NOT NULL, changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    execute(engine, f"CREATE TRIGGER items_changelog_u AFTER UPDATE ON items BEGIN "
+                    f"INSERT INTO {CHANGELOG_TABLE} (table_name, row_key, op) VALUES ('items', new.id, 'U'); END")
+    execute(engine, "INSERT INTO items (id, name) VALUES (1, 'a')")
+    feed = ChangeFeed(engine, Item)
+    feed.start()
+    execute(engine, "UPDATE items SET id = 5 WHERE id = 1")
+
+    assert fetch(feed)[1:] == ([5], [1])
+
+
+def test_pruning_past_the_watermark_asks_for_a_reload(engine):
+    feed = ChangeFeed(engine, Item, retention_days=7)
+    feed.start()
+    execute(engine, "INSERT INTO items (id, name) VALUES (1, 'a'), (2, 'b')")
+    execute(engine, "DELETE FROM items WHERE id = 1")
+    execute(engine, f"UPDATE {CHANGELOG_TABLE} SET changed_at = datetime('now', '-30 days')")
+    execute(engine, "INSERT INTO items (id, name) VALUES (3, 'c')")
+
+    # A client that is up to date keeps polling normally
+    current = ChangeFeed(engine, Item, retention_days=7)
+    current.start()  # Also prunes the backdated entries
+    with engine.connect() as conn:
+        assert conn.execute(text(f"SELECT COUNT(*) FROM {CHANGELOG_TABLE}")).scalar() == 1
+    assert fetch(current) == (current.watermark, [], [])
+
+    # The first client missed the delete of 1, so it must reload instead of patching
+    watermark, keys, removed = fetch(feed)
+    assert keys is None
+    with engine.connect() as conn:
+        assert watermark == feed.changelog.watermark(conn)
+
+    reloads = []
+    feed.reset.connect(lambda: reloads.append(True))
+    feed._on_fetched(0, (watermark, None, [], None))
+    assert reloads == [True] and feed.watermark == watermark
+    assert fetch(feed) == (watermark, [], [])
+
+
+def test_visible_keys_are_checked_once_per_batch(engine):
+    feed = ChangeFeed(engine, Item)
+    feed.start()
+    execute(engine, "INSERT INTO items (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'a')")
+    execute(engine, "DELETE FROM items WHERE id = 3")
+    calls = []
+
+    def visible_keys(session, keys):
+        calls.append(sorted(keys))
+        return {key for key, in session.query(Item.id).filter(Item.name == 'a', Item.id.in_(keys))}
+
+    assert fetch(feed, visible_keys)[1:] == ([1, 2], [3], {1})
+    assert calls == [[1, 2]]  # Removed keys need no check
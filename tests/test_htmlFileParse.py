@@ -0,0 +1,150 @@
+import os
+import random
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('lxml')
+pytest.importorskip('pandas')
+
+import htmlFileParse  # noqa: E402
+from htmlFileParse import parse_rules_lxml, parse_rules_soup  # noqa: E402
+
+REPORT = """<html><body>
+<h1>Rules</h1>
+<a name="r1">rule1</a>
+<blockquote><p>About</p><pre>  if x &gt; 1
+    then y  </pre></blockquote>
+<dl><dt>Owner</dt><dd> Bob </dd><dt>Status</dt><dd><b>Active</b> now</dd></dl>
+<a name="r2"> rule2 </a>
+<blockquote>No logic here</blockquote>
+<dl><dt>Owner</dt><dd>Al</dd><dt>Empty</dt><dd></dd></dl>
+<a name="r3"></a>
+</body></html>
+"""
+
+
+def random_report(rng):
+    """A report built from the pieces real ones have, in random order and with random whitespace."""
+    def text():
+        words = rng.choice(['', 'a', 'rule', 'x > 1', 'two  words', 'tab\there', 'é', '&amp;'])
+        return rng.choice(['', ' ', '\n', '  \n\t']) + words + rng.choice(['', ' ', '\n'])
+
+    def inline():
+        return rng.choice(['{}', '<b>{}</b>', '<i>{}<br>{}</i>', '<!-- c -->{}', '<span> {} </span>']).format(
+            text(), text())
+
+    parts = ['<html><body>']
+    for _ in range(rng.randint(0, 12)):
+        kind = rng.random()
+        if kind < 0.3:
+            parts.append(f'<a name="n{rng.randint(0, 99)}">{inline()}</a>')
+        elif kind < 0.5:
+            inner = ''.join(rng.choice([inline(), f'<pre>{text()}\n {text()}</pre>', f'<p>{inline()}</p>'])
+                            for _ in range(rng.randint(0, 3)))
+            parts.append(f'<blockquote>{inner}</blockquote>')
+        elif kind < 0.7:
+            items = ''.join(f'<dt>{inline()}</dt><dd>{inline()}</dd>' if rng.random() < 0.8 else f'<dt>{text()}</dt>'
+                            for _ in range(rng.randint(0, 4)))
+            parts.append(f'<dl>{items}</dl>')
+        elif kind < 0.8:
+            parts.append(f'<pre>{text()}</pre>')
+        elif kind < 0.9:
+            parts.append(f'<a href="#x">{inline()}</a>')
+        else:
+            parts.append(f'<div>{inline()}</div>')
+        parts.append(rng.choice(['', '\n', ' ']))
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def write(tmp_path, name, html):
+    path = tmp_path / name
+    path.write_text(html, encoding='utf-8')
+    return str(path)
+
+
+def test_engines_parse_the_sample_report_alike(tmp_path):
+    path = write(tmp_path, 'report.html', REPORT)
+    rules = parse_rules_soup(path)
+    assert [rule['Rule Name'] for rule in rules] == ['rule1', 'rule2', None]
+    assert rules[0]['Rule Logic'] == 'if x > 1\n    then y'
+    assert rules[0]['Status'] == 'Active now'
+    assert 'Rule Logic' not in rules[1]
+    assert parse_rules_lxml(path) == rules
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_engines_agree_on_random_reports(tmp_path, seed):
+    path = write(tmp_path, 'report.html', random_report(random.Random(seed)))
+    assert parse_rules_lxml(path) == parse_rules_soup(path)
+
+
+def test_lxml_engine_handles_files_larger_than_one_feed(tmp_path, monkeypatch):
+    monkeypatch.setattr(htmlFileParse, 'CHUNK_SIZE', 7)  # Split tags and text across feeds
+    path = write(tmp_path, 'report.html', REPORT)
+    assert parse_rules_lxml(path) == parse_rules_soup(path)
+
+
+@pytest.fixture
+def parsed_files(monkeypatch):
+    """Record which files parse_file_chunk actually parses."""
+    parsed = []
+    parse_file_chunk = htmlFileParse.parse_file_chunk
+
+    def recording_parse(task):
+        parsed.append(task[0])
+        return parse_file_chunk(task)
+
+    monkeypatch.setattr(htmlFileParse, 'parse_file_chunk', recording_parse)
+    return parsed
+
+
+def test_rule_cache_only_reparses_changed_reports(tmp_path, parsed_files):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    first = write(reports, 'a.html', REPORT)
+    second = write(reports, 'b.html', REPORT.replace('rule1', 'ruleB'))
+    cache = htmlFileParse.RuleCache(str(tmp_path / 'cache.db'))
+    try:
+        chunks = htmlFileParse.parse_chunks_cached([first, second], cache)
+        assert sorted(parsed_files) == sorted([first, second])
+        assert chunks == list(htmlFileParse.map_chunks([first, second]))
+
+        # Unchanged, then touched without changing content: nothing is parsed
+        parsed_files.clear()
+        assert htmlFileParse.parse_chunks_cached([first, second], cache) == chunks
+        stat = (tmp_path / 'reports' / 'a.html').stat()
+        os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert htmlFileParse.parse_chunks_cached([first, second], cache) == chunks
+        assert parsed_files == []
+        assert cache.entries()[first][0] == stat.st_mtime_ns + 10 ** 9
+
+        # Changed content is parsed again
+        write(reports, 'a.html', REPORT.replace('Bob', 'Carol'))
+        chunks = htmlFileParse.parse_chunks_cached([first, second], cache)
+        assert parsed_files == [first]
+        assert 'Carol' in chunks[0].values
+
+        # A report that is gone is dropped from the cache
+        os.remove(second)
+        assert htmlFileParse.parse_chunks_cached([first], cache) == chunks[:1]
+        assert set(cache.entries()) == {first}
+    finally:
+        cache.close()
+
+
+def test_cached_dataframe_and_export_match_uncached(tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    write(reports, 'a.html', REPORT)
+    write(reports, 'b.html', REPORT.replace('Owner', 'Team'))
+    expected = htmlFileParse.parse_html_to_dataframe(str(reports))
+    cache_path = str(tmp_path / 'cache.db')
+    for _ in range(2):  # Filling the cache, then reading from it
+        assert htmlFileParse.parse_html_to_dataframe(str(reports), cache_path=cache_path).equals(expected)
+
+    output = tmp_path / 'rules.csv'
+    assert htmlFileParse.export_rules(str(reports), str(output), cache_path=cache_path) == len(expected)
+    header = output.read_text(encoding='utf-8').splitlines()[0]
+    assert header.split(',') == list(expected.columns)
@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from ingestSinks import Sink, SqliteSink, batched_scripts
+
+DETAIL_TABLES = {
+    "lul_names": ("scripts_lul_names", ("lul_name",)),
+    "steps": ("scripts_steps", ("step_order", "step_name")),
+}
+
+
+def script(name, code, lul_names=(), steps=()):
+    return name, code, {"lul_names": [(lul_name,) for lul_name in lul_names], "steps": list(steps)}
+
+
+@pytest.fixture
+def sink():
+    sink = SqliteSink(sqlite3.connect(":memory:"), "scripts", DETAIL_TABLES, batch_size=2)
+    sink.create_tables()
+    yield sink
+    sink.close()
+
+
+def rows(sink, table):
+    return sorted(sink.connection.execute(f"SELECT * FROM {table}").fetchall())
+
+
+def test_sink_subclass_must_implement_every_method():
+    class PartialSink(Sink):
+        def create_tables(self):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialSink("scripts", DETAIL_TABLES)
+
+
+def test_batched_scripts_ends_batches_on_count_or_bytes():
+    scripts = [("a", "x" * 10, {}), ("b", "x", {}), ("c", "x" * 20, {}), ("d", "x", {}), ("e", "x", {})]
+
+    def names(batch_size, max_batch_bytes):
+        return [[name for name, _, _ in batch] for batch in batched_scripts(scripts, batch_size, max_batch_bytes)]
+
+    assert names(2, 1000) == [["a", "b"], ["c", "d"], ["e"]]
+    assert names(10, 15) == [["a", "b", "c"], ["d", "e"]]
+
+
+def test_append_loads_scripts_and_details(sink):
+    count, detail_counts = sink.append([
+        script("a.sas", "code a", ["lul1"], [(0, "work.a")]),
+        script("b.sas", "code b", ["lul2", "lul3"]),
+        script("c.sas", "code c"),
+    ])
+    assert count == 3
+    assert detail_counts == {"lul_names": 3, "steps": 1}
+    assert rows(sink, "scripts") == [("a.sas", "code a"), ("b.sas", "code b"), ("c.sas", "code c")]
+    assert rows(sink, "scripts_lul_names") == [("a.sas", "lul1"), ("b.sas", "lul2"), ("b.sas", "lul3")]
+    assert rows(sink, "scripts_steps") == [("a.sas", 0, "work.a")]
+
+
+def test_sync_replaces_changed_and_removes_deleted_scripts(sink):
+    sink.append([script("a.sas", "old a", ["lul1"]), script("b.sas", "b", ["lul2"]), script("c.sas", "c")])
+
+    changed, deleted, detail_counts = sink.sync([script("a.sas", "new a", ["lul9"])], lambda: ["b.sas"])
+
+    assert (changed, deleted) == (1, 1)
+    assert detail_counts == {"lul_names": 1, "steps": 0}
+    assert rows(sink, "scripts") == [("a.sas", "new a"), ("c.sas", "c")]
+    assert rows(sink, "scripts_lul_names") == [("a.sas", "lul9")]
+
+
+def test_sync_failure_rolls_back_everything(sink):
+    sink.append([script("a.sas", "a", ["lul1"]), script("b.sas", "b")])
+
+    def changed_scripts():
+        yield script("a.sas", "new a")
+        yield script("b.sas", "new b")
+        yield script("c.sas", "c")  # A full batch has been written by now
+        raise OSError("disk went away")
+
+    with pytest.raises(OSError):
+        sink.sync(changed_scripts(), lambda: [])
+    assert rows(sink, "scripts") == [("a.sas", "a"), ("b.sas", "b")]
+    assert rows(sink, "scripts_lul_names") == [("a.sas", "lul1")]
@@ -0,0 +1,70 @@
+import pytest
+
+from ruleWriters import CsvWriter, DatabaseWriter, sql_column_names
+
+COLUMNS = ['Rule Name', 'Owner', 'owner', 'Line\tbreak\nkey', '']
+
+
+def test_sql_column_names_are_unique_ignoring_case():
+    assert sql_column_names(COLUMNS) == ['Rule Name', 'Owner', 'owner_2', 'Line break key', 'column']
+    assert sql_column_names(['a', 'A', 'a_2']) == ['a', 'A_2', 'a_2_2']
+
+
+def test_sql_column_names_fit_max_length():
+    names = sql_column_names(['x' * 70, 'X' * 70], max_length=63)
+    assert names == ['x' * 63, 'X' * 61 + '_2']
+
+
+def test_database_writer_accepts_keys_differing_in_case(tmp_path):
+    sqlalchemy = pytest.importorskip('sqlalchemy')
+    url = f"sqlite:///{tmp_path / 'rules.db'}"
+    writer = DatabaseWriter(url)
+    writer.open(COLUMNS)
+    writer.write_rows([['rule1', 'bob', 'al', 'v', None]])
+    writer.close()
+
+    engine = sqlalchemy.create_engine(url)
+    with engine.connect() as connection:
+        result = connection.exec_driver_sql("SELECT * FROM rules")
+        assert list(result.keys()) == sql_column_names(COLUMNS)
+        assert result.fetchall() == [('rule1', 'bob', 'al', 'v', None)]
+    engine.dispose()
+
+
+def test_database_writer_abort_keeps_previous_table(tmp_path):
+    sqlalchemy = pytest.importorskip('sqlalchemy')
+    url = f"sqlite:///{tmp_path / 'rules.db'}"
+    writer = DatabaseWriter(url)
+    writer.open(['Rule Name'])
+    writer.write_rows([['old']])
+    writer.close()
+
+    writer = DatabaseWriter(url)
+    writer.open(['Rule Name', 'Owner'])
+    writer.write_rows([['new', 'bob']])
+    writer.abort()
+
+    engine = sqlalchemy.create_engine(url)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT * FROM rules").fetchall() == [('old',)]
+    engine.dispose()
+
+
+def test_file_writer_abort_leaves_no_output(tmp_path):
+    path = tmp_path / 'rules.csv'
+    writer = CsvWriter(str(path))
+    writer.open(['Rule Name'])
+    writer.write_rows([['rule1']])
+    writer.abort()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_file_writer_replaces_output_on_close(tmp_path):
+    path = tmp_path / 'rules.csv'
+    path.write_text('stale')
+    writer = CsvWriter(str(path))
+    writer.open(['Rule Name'])
+    writer.write_rows([['rule1']])
+    writer.close()
+    assert path.read_text(encoding='utf-8').splitlines() == ['Rule Name', 'rule1']
+    assert [p.name for p in tmp_path.iterdir()] == ['rules.csv']
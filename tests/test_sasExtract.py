@@ -0,0 +1,58 @@
+from sasExtract import DETAIL_COLUMNS, SAS_PATTERN, extract
+
+SCRIPT = """\
+/* Header: %let ll_name = commented_out; data fake; */
+%let ll_name = main_lul;
+%LET ll_name02 = second_lul ;
+%let ll_name03 = &other;
+%let outdir = /data/out;
+libname raw '/data/raw';
+LIBNAME mart "/data/mart";
+%include '/code/common.sas';
+* data skipped; this is a comment statement;
+data work.step1; set raw.input; run;
+proc sort data=work.step1; by id; run;
+  DATA &outlib..final; set work.step1; run;
+"""
+
+
+def test_extract_finds_every_kind_in_one_pass():
+    details = extract(SCRIPT)
+    assert set(details) == set(DETAIL_COLUMNS)
+    assert details["macros"] == [
+        ("ll_name", "main_lul"),
+        ("ll_name02", "second_lul"),
+        ("ll_name03", "&other"),
+        ("outdir", "/data/out"),
+    ]
+    assert details["lul_names"] == [("main_lul",), ("second_lul",)]
+    assert details["libnames"] == [("raw", "/data/raw"), ("mart", "/data/mart")]
+    assert details["includes"] == [("/code/common.sas",)]
+    assert details["steps"] == [(0, "data", "work.step1"), (1, "proc", "sort"), (2, "data", "&outlib..final")]
+
+
+def test_rows_match_detail_columns():
+    details = extract(SCRIPT)
+    for kind, columns in DETAIL_COLUMNS.items():
+        assert all(len(row) == len(columns) for row in details[kind]), kind
+
+
+def test_comments_hide_statements():
+    assert extract("/* %let ll_name = x; libname a 'b'; */") == {kind: [] for kind in DETAIL_COLUMNS}
+    assert [match.lastgroup for match in SAS_PATTERN.finditer("/* a */ %let b = 1;")] == ["comment", "macro_value"]
+
+
+def test_comment_statement_after_another_statement():
+    details = extract('data a; run; * comment with libname foo "/x";\nlibname real "/y";  *%let ll_name = no;')
+    assert details["libnames"] == [("real", "/y")]
+    assert details["macros"] == []
+    assert details["steps"] == [(0, "data", "a")]
+
+
+def test_lul_name_macro_needs_a_plain_word_value():
+    details = extract("%let ll_name = two words; %let ll_name1 = ok_1; %let lul_name = no;")
+    assert details["lul_names"] == [("ok_1",)]
+
+
+def test_empty_script():
+    assert extract("") == {kind: [] for kind in DETAIL_COLUMNS}
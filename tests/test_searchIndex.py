@@ -0,0 +1,81 @@
+import random
+
+from searchIndex import RowSearchIndex
+
+WORDS = ['Alice', 'alfred', 'Bob', 'bobby', 'Carol', 'CARLOS', 'dave', None, '', 'Élodie', 'x']
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    return [(row_id, rng.choice(WORDS), rng.choice(WORDS)) for row_id in range(count)]
+
+
+def text_values(row):
+    return row[1:]
+
+
+def expected(rows, text):
+    """The database's case-insensitive substring OR filter, row by row."""
+    text = text.lower()
+    return [row for row in rows
+            if not text or any(value is not None and text in str(value).lower() for value in text_values(row))]
+
+
+def build_index(rows, **kwargs):
+    index = RowSearchIndex(text_values, **kwargs)
+    index.build(rows)
+    return index
+
+
+def test_search_matches_substring_filter():
+    rows = make_rows(300)
+    index = build_index(rows)
+    for text in ['', 'a', 'al', 'ali', 'ALICE', 'bob', 'bobb', 'los', 'élo', 'zzz', 'e', 'ice']:
+        assert index.search(text) == expected(rows, text), text
+
+
+def test_cached_and_refined_searches_stay_correct():
+    rows = make_rows(300, seed=1)
+    index = build_index(rows, cache_size=2)
+    # Typing a word letter by letter refines earlier results; repeats come from the cache
+    for text in ['c', 'ca', 'car', 'carl', 'car', 'c', 'carol', 'ca']:
+        assert index.search(text) == expected(rows, text), text
+    assert len(index.cache) == 2
+
+
+def test_build_replaces_previous_rows():
+    index = build_index(make_rows(50))
+    index.search('bob')
+    rows = make_rows(20, seed=2)
+    index.build(rows)
+    assert index.is_built
+    assert index.search('bob') == expected(rows, 'bob')
+
+
+def test_add_and_remove_keep_cached_results_current():
+    rows = make_rows(200, seed=3)
+    index = build_index(rows)
+    searches = ['bo', 'bob', 'al', 'carlos']
+    for text in searches:
+        index.search(text)  # Fill the cache before changing rows
+
+    for new_row in [(1000, 'Bobcat', None), (1001, 'nobody', 'Alfredo'), (1002, None, 'carlos')]:
+        index.add(new_row)
+        rows.append(new_row)
+    removed_ids = {3, 50, 1001}
+    index.remove(lambda row: row[0] in removed_ids)
+    rows = [row for row in rows if row[0] not in removed_ids]
+
+    for text in searches + ['', 'cat', 'fred']:
+        assert index.search(text) == expected(rows, text), text
+
+
+def test_updated_row_is_found_by_its_new_values():
+    rows = make_rows(100, seed=4)
+    index = build_index(rows)
+    index.search('zebra')
+    updated = (7, 'Zebra', None)
+    index.remove(lambda row: row[0] == 7)
+    index.add(updated)
+    assert index.search('zebra') == [updated]
+    assert [row for row in index.search('') if row[0] == 7] == [updated]
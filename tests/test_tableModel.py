@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+pytest.importorskip('PyQt6.QtCore')
+from PyQt6.QtCore import Qt  # noqa: E402
+
+from tableModel import ColumnTableModel  # noqa: E402
+
+FIELDS = ['id', 'group', 'score']
+
+
+def make_model(rows, group_column=None, sort_column=0, order=Qt.SortOrder.AscendingOrder):
+    model = ColumnTableModel(FIELDS)
+    model.set_rows(rows, group_column=group_column)
+    model.sort(sort_column, order)
+    return model
+
+
+@pytest.mark.parametrize('group_column', [None, 'group'])
+@pytest.mark.parametrize('sort_column', [0, 2])
+@pytest.mark.parametrize('order', [Qt.SortOrder.AscendingOrder, Qt.SortOrder.DescendingOrder])
+def test_find_update_and_remove_records(group_column, sort_column, order):
+    rng = random.Random(0)
+    rows = [(key, rng.choice(['a', 'b', None]), rng.random()) for key in rng.sample(range(1000), 80)]
+    model = make_model(rows, group_column, sort_column, order)
+
+    for key, _, _ in rows:
+        row = model.find_record(0, key)
+        assert row is not None and not model.header_rows[row] and model.columns[0][row] == key
+    assert model.find_record(0, 5000) is None
+
+    for key, _, _ in rows[:20]:
+        model.update_record(0, (key, rng.choice(['a', 'c', None]), rng.random()))
+        assert model.columns[0][model.find_record(0, key)] == key
+    for key, _, _ in rows[20:40]:
+        assert model.remove_record(0, key)
+        assert model.find_record(0, key) is None
+
+    keys = [key for key, flag in zip(model.columns[0], model.header_rows) if not flag]
+    assert sorted(keys) == sorted(key for key, _, _ in rows[:20] + rows[40:])